@@ -1,143 +1,146 @@
-from flask import Flask, jsonify
+import os
+from settings import CFG
+
+# Under eventlet workers blocking I/O must be patched before flask/requests are imported
+if CFG.socketio_async_mode == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+
+from flask import Flask, Response, request
 from routes.hubspot_auth import auth_bp
 from routes.prediction import prediction_bp
 from routes.dashboard import dashboard_bp, init_socketio  # Add these imports
-import os
-from dotenv import load_dotenv
+from utils.json_utils import OrjsonProvider, dumps
+import gzip
+import hashlib
+import logging
+import time
 from flask_cors import CORS
 
-# Load environment variables
-load_dotenv()
+try:
+    import brotli
+except ImportError:
+    brotli = None  # brotli is optional - gzip is always available
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None  # flask-compress is optional - dynamic responses go out uncompressed
+
+logging.basicConfig(level=CFG.log_level, format='%(asctime)s %(levelname)s %(message)s')
+logger = logging.getLogger('catchlead')
 
 # Initialize Flask app
 app = Flask(__name__)
-app.secret_key = os.getenv('FLASK_SECRET_KEY', 'your-secret-key-here')
+app.secret_key = CFG.secret_key
+
+# orjson for every jsonify() response (predictions pages included), not only the dashboard
+app.json = OrjsonProvider(app)
+
+# Compress dynamic JSON (prediction pages, summaries) on the way out. Level 4 trades a little
+# ratio for CPU; pre-encoded responses already carry Content-Encoding and are left alone
+if Compress is not None:
+    app.config.update(
+        COMPRESS_MIMETYPES=['application/json'],
+        COMPRESS_ALGORITHM=['br', 'gzip'],
+        COMPRESS_LEVEL=4,
+        COMPRESS_BR_LEVEL=4
+    )
+    Compress(app)
+
+# Enable CORS once at startup instead of rewriting headers in an after_request hook.
+# flask-cors answers preflights itself (only for routes that exist), cached for max_age seconds
+CORS(
+    app,
+    resources={r"/*": {"origins": "*"}},
+    methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400
+)
+
+# Accept trailing-slash variants without a 308 redirect round-trip. Rules pick this up
+# when they are added, so it must be set before the blueprints are registered.
+app.url_map.strict_slashes = False
 
-# Register blueprints
+# Register blueprints (dashboard first - it carries most of the traffic)
+app.register_blueprint(dashboard_bp)  # Add dashboard blueprint
 app.register_blueprint(auth_bp)
 app.register_blueprint(prediction_bp, url_prefix='/api')
-app.register_blueprint(dashboard_bp)  # Add dashboard blueprint
+
+def warmup():
+    """Pay JIT compile / cache loads at process start rather than on the first user request"""
+    try:
+        from utils.data_loader import warm_up_kernels
+        warm_up_kernels()
+    except Exception as e:
+        # A missing optional dependency must never prevent the API from booting
+        logger.warning("Warm-up skipped: %s", e)
+    
+    # Push new prediction files to the dashboard as they land (no-op without watchdog)
+    try:
+        from utils.data_loader import start_prediction_watcher
+        from routes.prediction import emit_prediction_update
+        start_prediction_watcher(on_change=emit_prediction_update)
+    except Exception as e:
+        logger.warning("Prediction watcher not started: %s", e)
 
 # Initialize SocketIO for real-time dashboard
-socketio = init_socketio(app)
+socketio = init_socketio(app, async_mode=CFG.socketio_async_mode)
+
+def precompress(body):
+    """Pre-encode a static body once so no compression happens per request"""
+    encoded = {'gzip': gzip.compress(body, 9)}
+    if brotli is not None:
+        encoded['br'] = brotli.compress(body, quality=11)
+    return encoded
+
+def negotiated_response(body, encoded, mimetype, status=200, etag=None):
+    """Pick the best pre-encoded variant the client accepts (304 if it already has it)"""
+    encoding = None
+    for candidate in ('br', 'gzip'):
+        if candidate in encoded and request.accept_encodings[candidate] > 0:
+            encoding = candidate
+            break
+    
+    # Each encoded variant gets its own strong validator
+    variant_etag = None
+    if etag is not None:
+        variant_etag = f"{etag}-{encoding}" if encoding else etag
+        if variant_etag in request.if_none_match:
+            response = Response(status=304)
+            response.set_etag(variant_etag)
+            response.headers['Vary'] = 'Accept-Encoding'
+            return response
+    
+    if encoding is not None:
+        response = Response(encoded[encoding], status=status, mimetype=mimetype)
+        response.headers['Content-Encoding'] = encoding
+    else:
+        response = Response(body, status=status, mimetype=mimetype)
+    if variant_etag is not None:
+        response.set_etag(variant_etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+# Landing page lives in static/index.html (a reverse proxy can serve it directly);
+# read and pre-encode it once at import instead of per request
+with open(os.path.join(app.static_folder, 'index.html'), 'rb') as f:
+    _INDEX_HTML = f.read()
+_INDEX_ENCODED = precompress(_INDEX_HTML)
+_INDEX_ETAG = hashlib.blake2b(_INDEX_HTML, digest_size=16).hexdigest()
 
 @app.route('/')
 def index():
     """Main landing page with available endpoints"""
-    return '''
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Lead Scoring MLOps API</title>
-        <style>
-            body { font-family: Arial, sans-serif; margin: 40px; }
-            .endpoint { margin: 10px 0; padding: 10px; background: #f5f5f5; border-radius: 5px; }
-            .method { color: #007bff; font-weight: bold; }
-            .auth { color: #28a745; }
-            .predictions { color: #6f42c1; }
-            .dashboard { color: #fd7e14; }  /* Add dashboard styling */
-            h1 { color: #333; }
-            h2 { color: #666; margin-top: 30px; }
-        </style>
-    </head>
-    <body>
-        <h1>🚀 Lead Scoring MLOps API</h1>
-        <p>Welcome to the Lead Scoring API with Real-Time Dashboard support.</p>
-        
-        <h2 class="dashboard">📊 Dashboard Endpoints (NEW!)</h2>
-        <div class="endpoint">
-            <span class="method">GET</span> <a href="/api/dashboard/status">/api/dashboard/status</a> - Dashboard API status
-        </div>
-        <div class="endpoint">
-            <span class="method">GET</span> <a href="/api/dashboard/executive-summary">/api/dashboard/executive-summary</a> - Executive metrics
-        </div>
-        <div class="endpoint">
-            <span class="method">GET</span> <a href="/api/dashboard/real-time-performance">/api/dashboard/real-time-performance</a> - Real-time performance
-        </div>
-        <div class="endpoint">
-            <span class="method">GET</span> <a href="/api/dashboard/conversion-trends">/api/dashboard/conversion-trends</a> - Conversion trends
-        </div>
-        <div class="endpoint">
-            <span class="method">GET</span> <a href="/api/dashboard/system-health">/api/dashboard/system-health</a> - System health
-        </div>
-        <div class="endpoint">
-            <span class="method">GET</span> <a href="/api/dashboard/live-stats">/api/dashboard/live-stats</a> - Live statistics
-        </div>
-        <div class="endpoint">
-            <span class="method">GET</span> <a href="/api/dashboard/predictions-overview">/api/dashboard/predictions-overview</a> - Predictions overview
-        </div>
-        <div class="endpoint">
-            <span class="method">WebSocket</span> ws://localhost:5000/socket.io/ - Real-time dashboard updates
-        </div>
-        
-        <h2 class="auth">🔐 Authentication Endpoints</h2>
-        <div class="endpoint">
-            <span class="method">GET</span> <a href="/connect-hubspot">/connect-hubspot</a> - Connect to HubSpot OAuth
-        </div>
-        <div class="endpoint">
-            <span class="method">GET</span> <a href="/oauth-callback">/oauth-callback</a> - OAuth callback handler
-        </div>
-        <div class="endpoint">
-            <span class="method">GET</span> <a href="/auth-status">/auth-status</a> - Check authentication status
-        </div>
-        
-        <h2 class="predictions">📊 Predictions API Endpoints</h2>
-        <div class="endpoint">
-            <span class="method">GET</span> <a href="/api/predictions">/api/predictions</a> - Get all lead predictions (with filtering & pagination)
-        </div>
-        <div class="endpoint">
-            <span class="method">GET</span> <a href="/api/predictions/summary">/api/predictions/summary</a> - Get prediction summary statistics
-        </div>
-        <div class="endpoint">
-            <span class="method">GET</span> /api/predictions/&lt;lead_id&gt; - Get specific lead prediction
-        </div>
-        <div class="endpoint">
-            <span class="method">GET</span> <a href="/api/predictions/high-probability">/api/predictions/high-probability</a> - Get high-probability leads (>70%)
-        </div>
-        
-        <h2>📋 Query Parameters (for /api/predictions)</h2>
-        <ul>
-            <li><strong>prediction</strong>: Filter by prediction (0 or 1)</li>
-            <li><strong>min_probability</strong>: Minimum probability threshold (0.0-1.0)</li>
-            <li><strong>max_probability</strong>: Maximum probability threshold (0.0-1.0)</li>
-            <li><strong>page</strong>: Page number for pagination (default: 1)</li>
-            <li><strong>per_page</strong>: Items per page (default: 25)</li>
-        </ul>
-        
-        <h2>🔄 WebSocket Events</h2>
-        <ul>
-            <li><strong>live_stats_update</strong>: Real-time system statistics (every 5s)</li>
-            <li><strong>performance_update</strong>: Model performance data (every 15s)</li>
-            <li><strong>health_update</strong>: System health metrics (every 30s)</li>
-            <li><strong>prediction_summary_update</strong>: Prediction statistics (every 60s)</li>
-            <li><strong>request_update</strong>: Manual update request (client → server)</li>
-            <li><strong>request_prediction_details</strong>: Request detailed predictions (client → server)</li>
-        </ul>
-        
-        <h2>🔧 Examples</h2>
-        <ul>
-            <li><a href="/api/predictions?prediction=1">/api/predictions?prediction=1</a> - Get positive predictions</li>
-            <li><a href="/api/predictions?min_probability=0.5">/api/predictions?min_probability=0.5</a> - Get leads with >50% probability</li>
-        </ul>
-        
-        <h2>🚀 WebSocket Usage</h2>
-        <p>Connect to real-time dashboard updates:</p>
-        <pre style="background: #f8f9fa; padding: 10px; border-radius: 5px;">
-const socket = io('http://localhost:5000');
-socket.on('performance_update', (data) => {
-    // Update your dashboard in real-time
-});
-        </pre>
-    </body>
-    </html>
-    '''
+    response = negotiated_response(_INDEX_HTML, _INDEX_ENCODED, 'text/html', etag=_INDEX_ETAG)
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response
 
-@app.route('/health')
-def health():
-    """Health check endpoint"""
-    return jsonify({
+def build_health_body(timestamp):
+    """Serialize the health payload for a given ISO timestamp"""
+    return dumps({
         "status": "healthy",
-        "timestamp": "2024-12-23T10:00:00Z",
+        "timestamp": timestamp,
         "version": "1.0.0",
         "components": {
             "api": "operational",
@@ -146,64 +149,95 @@ def health():
         }
     })
 
-@app.errorhandler(404)
-def not_found(error):
-    """Handle 404 errors"""
-    return jsonify({
-        "error": "Endpoint not found",
-        "message": "The requested endpoint does not exist",
-        "available_endpoints": [
-            "/",
-            "/health",
-            "/connect-hubspot",
-            "/auth-status",
-            "/api/predictions",
-            "/api/predictions/summary",
-            "/api/predictions/high-probability",
-            "/api/dashboard/status",
-            "/api/dashboard/executive-summary",
-            "/api/dashboard/real-time-performance",
-            "/api/dashboard/predictions-overview",
-            "/api/dashboard/live-stats",
-            "/api/dashboard/system-health"
-        ]
-    }), 404
-
-@app.errorhandler(500)
-def internal_error(error):
-    """Handle 500 errors"""
-    return jsonify({
-        "error": "Internal server error",
-        "message": "Something went wrong on our end"
-    }), 500
-
-# Enable CORS for API endpoints (optional)
-@app.after_request
-def after_request(response):
-    response.headers.add('Access-Control-Allow-Origin', '*')
-    response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
-    response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
-    return response
+# (epoch second, body, pre-encoded bodies) - rebuilt at most once per second
+_health_cache = (0, b'', {})
+
+@app.route('/health')
+def health():
+    """Health check endpoint"""
+    global _health_cache
+    now = int(time.time())
+    cached = _health_cache
+    if cached[0] != now:
+        body = build_health_body(time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(now)))
+        cached = _health_cache = (now, body, precompress(body))
+    return negotiated_response(cached[1], cached[2], 'application/json')
+
+# Error bodies never change - serialize them once at import
+_NOT_FOUND_BODY = dumps({
+    "error": "Endpoint not found",
+    "message": "The requested endpoint does not exist",
+    "available_endpoints": (
+        "/",
+        "/health",
+        "/connect-hubspot",
+        "/auth-status",
+        "/api/predictions",
+        "/api/predictions/stream",
+        "/api/predictions/summary",
+        "/api/predictions/high-probability",
+        "/api/dashboard/status",
+        "/api/dashboard/executive-summary",
+        "/api/dashboard/real-time-performance",
+        "/api/dashboard/predictions-overview",
+        "/api/dashboard/live-stats",
+        "/api/dashboard/system-health"
+    )
+})
+
+_INTERNAL_ERROR_BODY = dumps({
+    "error": "Internal server error",
+    "message": "Something went wrong on our end"
+})
+
+def static_json_handler(body, status):
+    """Error handler returning a pre-serialized body with precomputed headers"""
+    headers = [('Content-Type', 'application/json'), ('Content-Length', str(len(body)))]
+    
+    def handler(error):
+        # Fresh Response per error: after_request hooks (CORS, session) mutate headers
+        return Response(body, status=status, headers=headers)
+    return handler
+
+not_found = static_json_handler(_NOT_FOUND_BODY, 404)
+internal_error = static_json_handler(_INTERNAL_ERROR_BODY, 500)
+app.register_error_handler(404, not_found)
+app.register_error_handler(500, internal_error)
+
+# Assembled once and logged as a single record instead of one write per line
+STARTUP_BANNER = '\n'.join((
+    "🚀 Starting Lead Scoring MLOps API with Real-Time Dashboard...",
+    "📋 Available endpoints:",
+    "   - Main page: http://localhost:5000/",
+    "   - Health check: http://localhost:5000/health",
+    "   - HubSpot auth: http://localhost:5000/connect-hubspot",
+    "   - Predictions: http://localhost:5000/api/predictions",
+    "   - Dashboard API: http://localhost:5000/api/dashboard/status",
+    "   - WebSocket: ws://localhost:5000/socket.io/"
+))
 
 if __name__ == "__main__":
     # Check if required environment variables are set
-    required_vars = ['HUBSPOT_CLIENT_ID', 'HUBSPOT_CLIENT_SECRET']
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    required_vars = {
+        'HUBSPOT_CLIENT_ID': CFG.hubspot_client_id,
+        'HUBSPOT_CLIENT_SECRET': CFG.hubspot_client_secret
+    }
+    missing_vars = [var for var, value in required_vars.items() if not value]
     
     if missing_vars:
-        print(f"❌ Missing required environment variables: {', '.join(missing_vars)}")
-        print("Please set these in your .env file")
         # Don't exit if only missing HubSpot vars - dashboard still works
-        print("⚠️  Dashboard will work in demo mode without HubSpot integration")
+        logger.warning(
+            "❌ Missing required environment variables: %s\n"
+            "Please set these in your .env file\n"
+            "⚠️  Dashboard will work in demo mode without HubSpot integration",
+            ', '.join(missing_vars)
+        )
+    
+    logger.info(STARTUP_BANNER)
     
-    print("🚀 Starting Lead Scoring MLOps API with Real-Time Dashboard...")
-    print("📋 Available endpoints:")
-    print("   - Main page: http://localhost:5000/")
-    print("   - Health check: http://localhost:5000/health")
-    print("   - HubSpot auth: http://localhost:5000/connect-hubspot")
-    print("   - Predictions: http://localhost:5000/api/predictions")
-    print("   - Dashboard API: http://localhost:5000/api/dashboard/status")
-    print("   - WebSocket: ws://localhost:5000/socket.io/")
+    warmup()
     
     # Use socketio.run instead of app.run for WebSocket support
-    socketio.run(app, host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    # Debugger only when explicitly requested; the reloader's file watcher stays off
+    # (production should use the gunicorn entrypoint in wsgi.py)
+    socketio.run(app, host='0.0.0.0', port=5000, debug=CFG.debug, use_reloader=False)
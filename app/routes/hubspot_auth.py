@@ -1,19 +1,17 @@
 import json
 from flask import Blueprint, request, redirect, session, url_for
 import os
-from dotenv import load_dotenv
 import requests
-
-load_dotenv()
+from settings import CFG
 
 auth_bp = Blueprint('auth', __name__)
 
 # HubSpot auth config
-CLIENT_ID = os.getenv('HUBSPOT_CLIENT_ID')
-CLIENT_SECRET = os.getenv('HUBSPOT_CLIENT_SECRET')
+CLIENT_ID = CFG.hubspot_client_id
+CLIENT_SECRET = CFG.hubspot_client_secret
 REDIRECT_URI = 'http://localhost:5000/oauth-callback'
 SCOPES = 'crm.objects.contacts.read'
-TOKEN_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'hubspot_token.json')
+TOKEN_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'hubspot_token.json'))
 
 @auth_bp.route('/connect-hubspot')
 def connect_hubspot():
@@ -1,7 +1,15 @@
-from flask import Blueprint, jsonify, request
-from utils.data_loader import load_predictions, calculate_prediction_stats
+import logging
+
+from flask import Blueprint, Response, jsonify, request
+import numpy as np
+from utils.data_loader import load_predictions, rows_above_probability
+from utils.json_utils import dumps
+
+# Rows converted to dicts per chunk while streaming NDJSON
+STREAM_CHUNK_ROWS = 1000
 
 prediction_bp = Blueprint('predictions', __name__)
+logger = logging.getLogger(__name__)
 
 
 @prediction_bp.route('/predictions')
@@ -24,21 +32,19 @@ def get_predictions():
                 "message": "No prediction files found in the data/predictions directory"
             }), 404
         
-        predictions = data['predictions']
-        
-        # Apply filters
-        filtered_predictions = apply_filters(
-            predictions, 
+        # Apply filters as row positions; the filtered frame itself is never built
+        filtered_rows = apply_filters(
+            data, 
             prediction_filter, 
             min_probability, 
             max_probability
         )
         
-        # Apply pagination
-        paginated_data = paginate_predictions(filtered_predictions, page, per_page)
+        # Apply pagination - only the requested page is taken and converted to dicts
+        paginated_data = paginate_predictions(data['df'], filtered_rows, page, per_page)
         
         # Calculate summary stats
-        summary_stats = calculate_prediction_stats(predictions)
+        summary_stats = data['stats']
         
         response = {
             'predictions': paginated_data['predictions'],
@@ -52,6 +58,35 @@ def get_predictions():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@prediction_bp.route('/predictions/stream')
+def stream_predictions():
+    """Stream (optionally filtered) predictions as NDJSON, one lead per line"""
+    try:
+        data = load_predictions()
+        
+        if data is None:
+            return jsonify({"error": "No prediction data available"}), 404
+        
+        df = data['df']
+        rows = apply_filters(
+            data,
+            request.args.get('prediction'),
+            request.args.get('min_probability', type=float),
+            request.args.get('max_probability', type=float)
+        )
+        total = len(df) if rows is None else len(rows)
+        
+        def generate():
+            # Only one chunk of rows is ever materialized as dicts
+            for start in range(0, total, STREAM_CHUNK_ROWS):
+                chunk = take_rows(df, rows, start, start + STREAM_CHUNK_ROWS)
+                yield b''.join(dumps(row) + b'\n' for row in chunk)
+        
+        return Response(generate(), mimetype='application/x-ndjson')
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @prediction_bp.route('/predictions/summary')
 def get_predictions_summary():
     """Get high-level prediction statistics"""
@@ -61,8 +96,7 @@ def get_predictions_summary():
         if data is None:
             return jsonify({"error": "No prediction data available"}), 404
         
-        predictions = data['predictions']
-        summary = calculate_prediction_stats(predictions)
+        summary = data['stats']
         
         return jsonify({
             'summary': summary,
@@ -75,25 +109,23 @@ def get_predictions_summary():
 
 @prediction_bp.route('/predictions/high-probability')
 def get_high_probability_leads():
-    """Get leads with high conversion probability (>70%)"""
+    """Get leads with high conversion probability (>70% unless ?threshold= is given)"""
     try:
         data = load_predictions()
         
         if data is None:
             return jsonify({"error": "No prediction data available"}), 404
         
-        predictions = data['predictions']
+        threshold = request.args.get('threshold', 0.7, type=float)
         
-        # Filter for high probability leads
-        high_prob_leads = [
-            pred for pred in predictions 
-            if pred.get('probability', 0) > 0.7
-        ]
+        # Filter for high probability leads via the presorted column; only matching rows become dicts
+        rows = rows_above_probability(data['columns'], threshold)
+        high_prob_leads = data['df'].iloc[rows].to_dict('records')
         
         return jsonify({
             'high_probability_leads': high_prob_leads,
             'count': len(high_prob_leads),
-            'threshold': 0.7,
+            'threshold': threshold,
             'metadata': data['metadata'],
             'status': 'success'
         })
@@ -110,22 +142,17 @@ def get_prediction_by_id(lead_id):
         if data is None:
             return jsonify({"error": "No prediction data available"}), 404
         
-        predictions = data['predictions']
+        # Find prediction by lead_id - hash probe into the index built at load time
+        position = data['id_index'].get(str(lead_id))
         
-        # Find prediction by lead_id
-        prediction = next(
-            (pred for pred in predictions if str(pred.get('lead_id', '')) == str(lead_id)), 
-            None
-        )
-        
-        if prediction is None:
+        if position is None:
             return jsonify({
                 "error": "Lead not found",
                 "message": f"No prediction found for lead_id: {lead_id}"
             }), 404
         
         return jsonify({
-            'prediction': prediction,
+            'prediction': data['df'].iloc[position:position + 1].to_dict('records')[0],
             'metadata': data['metadata'],
             'status': 'success'
         })
@@ -134,29 +161,42 @@ def get_prediction_by_id(lead_id):
         return jsonify({"error": str(e)}), 500
 
 # Utility functions
-def apply_filters(predictions, prediction_filter, min_prob, max_prob):
-    """Apply filters to prediction data"""
-    filtered = predictions
+def apply_filters(data, prediction_filter, min_prob, max_prob):
+    """Row positions matching the filters (None when no filter is active)"""
+    if prediction_filter is None and min_prob is None and max_prob is None:
+        return None
+    
+    df = data['df']
+    mask = np.ones(len(df), dtype=bool)
     
     if prediction_filter is not None:
         prediction_value = int(prediction_filter)
-        filtered = [p for p in filtered if p.get('prediction') == prediction_value]
+        if 'prediction' in df.columns:
+            mask &= df['prediction'].to_numpy() == prediction_value
+        else:
+            mask[:] = False
     
+    probabilities = data['columns']['probabilities']
     if min_prob is not None:
-        filtered = [p for p in filtered if p.get('probability', 0) >= min_prob]
-    
+        mask &= probabilities >= min_prob
     if max_prob is not None:
-        filtered = [p for p in filtered if p.get('probability', 0) <= max_prob]
+        mask &= probabilities <= max_prob
     
-    return filtered
+    return np.flatnonzero(mask)
+
+def take_rows(df, rows, start, end):
+    """Convert rows[start:end] (or df[start:end] when rows is None) to dicts"""
+    if rows is None:
+        return df.iloc[start:end].to_dict('records')
+    return df.iloc[rows[start:end]].to_dict('records')
 
-def paginate_predictions(predictions, page, per_page):
-    """Paginate predictions data"""
-    total = len(predictions)
+def paginate_predictions(df, rows, page, per_page):
+    """Paginate predictions data (only the page's rows are ever copied or converted)"""
+    total = len(df) if rows is None else len(rows)
     start = (page - 1) * per_page
     end = start + per_page
     
-    paginated_predictions = predictions[start:end]
+    paginated_predictions = take_rows(df, rows, max(start, 0), max(end, 0))
     
     return {
         'predictions': paginated_predictions,
@@ -175,25 +215,25 @@ def emit_prediction_update():
     """Emit prediction updates to connected clients"""
     try:
         # Import socketio here to avoid circular imports
-        from routes.dashboard import socketio
+        from routes.dashboard import emit_to_dashboard
         
-        if socketio:
+        if emit_to_dashboard:
             # Get latest prediction summary
             data = load_predictions()
             if data:
-                summary = calculate_prediction_stats(data['predictions'])
+                summary = data['stats']
                 
                 # Emit to dashboard clients
-                socketio.emit('prediction_update', {
+                emit_to_dashboard('prediction_update', {
                     'summary': summary,
                     'metadata': data['metadata'],
                     'timestamp': data['metadata']['model_timestamp']
-                }, room='dashboard')
+                })
                 
-                print("📊 Prediction update emitted to dashboard")
+                logger.debug("Prediction update emitted to dashboard")
                 
     except Exception as e:
-        print(f" Error emitting prediction update: {e}")
+        logger.error("Error emitting prediction update: %s", e)
         
         
     
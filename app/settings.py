@@ -0,0 +1,17 @@
+import os
+from types import SimpleNamespace
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Environment snapshot taken once at import - import CFG instead of calling os.getenv per request
+CFG = SimpleNamespace(
+    secret_key=os.getenv('FLASK_SECRET_KEY', 'your-secret-key-here'),
+    hubspot_client_id=os.getenv('HUBSPOT_CLIENT_ID'),
+    hubspot_client_secret=os.getenv('HUBSPOT_CLIENT_SECRET'),
+    socketio_async_mode=os.getenv('SOCKETIO_ASYNC_MODE', 'eventlet'),
+    debug=os.getenv('FLASK_DEBUG', '0') == '1',
+    log_level=os.getenv('LOG_LEVEL', 'INFO').upper()
+)
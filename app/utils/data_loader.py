@@ -1,93 +1,302 @@
 
 import os
 import json
-import glob
+import logging
+import threading
+import time
 import re
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+HIGH_PROBABILITY_THRESHOLD = 0.7
+
+# Resolved once at import rather than joined and normalized on every load
+PREDICTIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'predictions'))
+
+# Pattern: lead_scores_1753049562162_20250720_211607.parquet (or legacy .csv)
+PREDICTION_FILE_RE = re.compile(r'lead_scores_(\d+)_(\d{8}_\d{6})\.(?:parquet|csv)$')
+
+# (path, st_mtime_ns) -> parsed prediction file, shared read-only between requests
+PREDICTION_CACHE_MAXSIZE = 4
+_prediction_cache = {}
+_prediction_cache_lock = threading.Lock()
+
+# Latest parsed file, memoized only while the directory watcher runs - the watcher
+# clears it, so a hit needs neither the directory scan nor the stat() call
+_latest_predictions = None
+_watch_generation = 0
+_prediction_observer = None
+
+# Events that can change which file is latest (watchdog also reports opens and reads)
+WATCH_INVALIDATE_EVENTS = frozenset(('created', 'modified', 'moved', 'deleted', 'closed'))
+# Events that mark a file as completely written - worth pushing to the dashboard
+WATCH_NOTIFY_EVENTS = frozenset(('moved', 'closed'))
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def summarize_predictions(probabilities, labels):
+        """Single pass over the score arrays: (total, positive, high probability, probability sum)"""
+        # Compare in the column's float32 rather than widening every element to float64
+        threshold = np.float32(HIGH_PROBABILITY_THRESHOLD)
+        positive = 0
+        high_prob = 0
+        prob_sum = 0.0
+        for i in range(probabilities.shape[0]):
+            probability = probabilities[i]
+            positive += labels[i]
+            high_prob += probability > threshold
+            prob_sum += probability
+        return probabilities.shape[0], positive, high_prob, prob_sum
+else:
+    def summarize_predictions(probabilities, labels):
+        """NumPy fallback: (total, positive, high probability, probability sum)"""
+        return (
+            probabilities.shape[0],
+            int(np.count_nonzero(labels)),
+            int(np.count_nonzero(probabilities > HIGH_PROBABILITY_THRESHOLD)),
+            float(probabilities.sum(dtype=np.float64))
+        )
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def synth_trends(hours, base_rate, seed):
+        """Fused trend synthesis: (conversion rates, prediction counts, conversion counts)"""
+        np.random.seed(seed)
+        rates = np.empty(hours, dtype=np.float64)
+        preds = np.empty(hours, dtype=np.int64)
+        convs = np.empty(hours, dtype=np.int64)
+        for i in range(hours):
+            # Cyclical pattern + noise + slight upward trend, clipped to realistic bounds
+            rate = base_rate + np.sin(i * 0.3) * 0.2 + np.random.standard_normal() * 0.15 + i * 0.01
+            rate = round(min(6.0, max(1.0, rate)), 2)
+            pred = np.random.randint(800, 1201)
+            rates[i] = rate
+            preds[i] = pred
+            convs[i] = int(rate * pred / 100)
+        return rates, preds, convs
+else:
+    def synth_trends(hours, base_rate, seed):
+        """NumPy fallback: (conversion rates, prediction counts, conversion counts)"""
+        rng = np.random.default_rng(seed)
+        i = np.arange(hours)
+        rates = np.clip(
+            base_rate + np.sin(i * 0.3) * 0.2 + rng.standard_normal(hours) * 0.15 + i * 0.01,
+            1.0, 6.0
+        ).round(2)
+        preds = rng.integers(800, 1201, hours)
+        convs = (rates * preds / 100).astype(np.int64)
+        return rates, preds, convs
+
+def warm_up_kernels():
+    """Compile (or load from cache) the numeric kernels before the first request"""
+    summarize_predictions(np.zeros(1, dtype=np.float32), np.zeros(1, dtype=np.int8))
+    synth_trends(1, 3.5, 0)
+
 def load_predictions():
+    global _latest_predictions
+    latest = _latest_predictions
+    if latest is not None:
+        return latest
+    generation = _watch_generation
+    
     try:
-        predictions_dir = os.path.join(
-            os.path.dirname(__file__), '..', '..', 
-            'data', 'predictions'
-        )
+        predictions_dir = PREDICTIONS_DIR
         
-        if not os.path.exists(predictions_dir):
-            print(f"Predictions directory not found: {predictions_dir}")
+        # Find all prediction files (pattern: lead_scores_*.parquet, legacy lead_scores_*.csv).
+        # One readdir pass with plain string tests - no fnmatch, no per-entry stat
+        try:
+            with os.scandir(predictions_dir) as entries:
+                prediction_files = [
+                    entry.path for entry in entries
+                    if entry.name.startswith('lead_scores_') and entry.name.endswith(('.parquet', '.csv'))
+                ]
+        except FileNotFoundError:
+            logger.warning("Predictions directory not found: %s", predictions_dir)
             return None
         
-        # Find all prediction files (pattern: lead_scores_*.csv)
-        prediction_pattern = os.path.join(predictions_dir, 'lead_scores_*.csv')
-        prediction_files = glob.glob(prediction_pattern)
-        
         if not prediction_files:
-            print(f"No prediction files found in: {predictions_dir}")
+            logger.warning("No prediction files found in: %s", predictions_dir)
             return None
         
         # Get the latest file based on model timestamp in filename
         latest_file = get_latest_prediction_file(prediction_files)
         
-        print(f"Loading latest predictions from: {os.path.basename(latest_file)}")
-        
-        # Read CSV with pandas
-        df = pd.read_csv(latest_file)
-        
-        # Convert to JSON format (list of dictionaries)
-        data = df.to_dict('records')
-        
-        # Add metadata about the file
+        # A rewritten file gets a new mtime and therefore a new cache key
         file_stats = os.stat(latest_file)
-        model_info = extract_model_info_from_filename(latest_file)
-        
-        file_info = {
-            'file_name': os.path.basename(latest_file),
-            'file_size': file_stats.st_size,
-            'file_modified': datetime.fromtimestamp(file_stats.st_mtime).isoformat(),
-            'total_predictions': len(data),
-            'model_timestamp': model_info['model_timestamp'],
-            'model_version': model_info['model_version'],
-            'unix_timestamp': model_info['unix_timestamp']
-        }
+        key = (latest_file, file_stats.st_mtime_ns)
+        cached = _prediction_cache.get(key)
+        if cached is not None:
+            return cached
         
-        return {
-            'predictions': data,
-            'metadata': file_info
-        }
+        # Parse once even when several request threads miss at the same time
+        with _prediction_cache_lock:
+            cached = _prediction_cache.get(key)
+            if cached is None:
+                cached = load_prediction_file(latest_file, file_stats)
+                if len(_prediction_cache) >= PREDICTION_CACHE_MAXSIZE:
+                    _prediction_cache.clear()
+                _prediction_cache[key] = cached
+            # Skip memoizing if the watcher fired while we were scanning
+            if _prediction_observer is not None and generation == _watch_generation:
+                _latest_predictions = cached
+        return cached
         
     except Exception as e:
-        print(f"Error loading predictions: {e}")
+        logger.error("Error loading predictions: %s", e)
         return None
 
+def predictions_version():
+    """Identity of the latest prediction data, None when there is none"""
+    data = load_predictions()
+    return data['version'] if data is not None else None
+
+def invalidate_latest_predictions():
+    """Forget the memoized latest file so the next load rescans the directory"""
+    global _latest_predictions, _watch_generation
+    with _prediction_cache_lock:
+        _watch_generation += 1
+        _latest_predictions = None
+
+if WATCHDOG_AVAILABLE:
+    class PredictionFileHandler(FileSystemEventHandler):
+        """Invalidates the latest-predictions memo when a lead_scores_* file changes"""
+        
+        def __init__(self, on_change=None):
+            super().__init__()
+            self.on_change = on_change
+        
+        def on_any_event(self, event):
+            if event.is_directory or event.event_type not in WATCH_INVALIDATE_EVENTS:
+                return
+            name = os.path.basename(getattr(event, 'dest_path', '') or event.src_path)
+            # Temp files from the writer's write-then-rename are ignored until they land
+            if not (name.startswith('lead_scores_') and name.endswith(('.parquet', '.csv'))):
+                return
+            invalidate_latest_predictions()
+            if self.on_change and event.event_type in WATCH_NOTIFY_EVENTS:
+                self.on_change()
+
+def start_prediction_watcher(on_change=None):
+    """Watch the predictions directory; returns False when watchdog is unavailable"""
+    global _prediction_observer
+    predictions_dir = PREDICTIONS_DIR
+    if not WATCHDOG_AVAILABLE or not os.path.isdir(predictions_dir):
+        return False
+    if _prediction_observer is not None:
+        return True
+    
+    observer = Observer()
+    observer.schedule(PredictionFileHandler(on_change), predictions_dir, recursive=False)
+    observer.start()
+    invalidate_latest_predictions()
+    _prediction_observer = observer
+    logger.info("Watching %s for new prediction files", predictions_dir)
+    return True
+
+def load_prediction_file(path, file_stats):
+    """Parse one prediction file into a DataFrame, column arrays and metadata"""
+    logger.debug("Loading latest predictions from: %s", os.path.basename(path))
+    
+    # Parquet is typed and columnar; CSV is still read for files written before the switch
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path, engine='pyarrow')
+    else:
+        df = pd.read_csv(path)
+    
+    # Column (SoA) copies of the fields the stats kernel reads, built once per file.
+    # float32 is plenty for a probability and halves the bytes every scan touches
+    columns = {
+        'probabilities': prediction_column(df, 'probability').astype(np.float32),
+        'labels': (prediction_column(df, 'prediction') == 1).astype(np.int8)
+    }
+    
+    # Records are serialized as float64 - widen the float32 score columns the writer stores
+    # (lead_score) and round off the float32 noise (0.8299999833 -> 0.83)
+    for name in df.columns[df.dtypes == np.float32]:
+        df[name] = df[name].astype(np.float64).round(6)
+    
+    # Ascending probability order, so threshold queries are a binary search plus a slice
+    probability_order = np.argsort(columns['probabilities'], kind='stable')
+    columns['probability_order'] = probability_order
+    columns['sorted_probabilities'] = columns['probabilities'][probability_order]
+    
+    # lead_id -> row position (first occurrence wins, like a linear scan)
+    id_index = {}
+    if 'lead_id' in df.columns:
+        for position, lead_id in enumerate(df['lead_id'].tolist()):
+            id_index.setdefault(str(lead_id), position)
+    
+    # Add metadata about the file
+    model_info = extract_model_info_from_filename(path)
+    
+    file_info = {
+        'file_name': os.path.basename(path),
+        'file_size': file_stats.st_size,
+        'file_modified': datetime.fromtimestamp(file_stats.st_mtime).isoformat(),
+        'total_predictions': len(df),
+        'model_timestamp': model_info['model_timestamp'],
+        'model_version': model_info['model_version'],
+        'unix_timestamp': model_info['unix_timestamp']
+    }
+    
+    # Shared between callers - treat as read-only. Records are not materialized here;
+    # endpoints convert only the rows they return with to_dict('records')
+    return {
+        'df': df,
+        'columns': columns,
+        'id_index': id_index,
+        # Computed once per (path, mtime) cache entry instead of per request
+        'stats': calculate_prediction_stats(columns['probabilities'], columns['labels']),
+        'metadata': file_info,
+        # Same (path, mtime) key the parse cache uses - changes whenever the latest data does
+        'version': (path, file_stats.st_mtime_ns)
+    }
+
+def rows_above_probability(columns, threshold):
+    """Row positions with probability > threshold, in file order (O(log N) search + result sort)"""
+    start = np.searchsorted(columns['sorted_probabilities'], threshold, side='right')
+    return np.sort(columns['probability_order'][start:])
+
+def prediction_column(df, name):
+    """Column values as an ndarray, 0 where the column or a value is missing"""
+    if name not in df.columns:
+        return np.zeros(len(df))
+    return df[name].fillna(0).to_numpy()
+
 def get_latest_prediction_file(prediction_files):
     """Get the latest prediction file based on model version timestamp in filename"""
     def extract_model_timestamp(filename):
-        """Extract model timestamp from filename for comparison"""
-        try:
-            # Extract the model timestamp part: 20250720_211607
-            pattern = r'lead_scores_\d+_(\d{8}_\d{6})\.csv'
-            match = re.search(pattern, filename)
-            
-            if match:
-                timestamp_str = match.group(1)  # "20250720_211607"
-                return datetime.strptime(timestamp_str, '%Y%m%d_%H%M%S')
-            else:
-                # Fallback to file modification time
-                return datetime.fromtimestamp(os.path.getmtime(filename))
-                
-        except Exception as e:
-            print(f"⚠️  Error parsing timestamp from {filename}: {e}")
-            return datetime.fromtimestamp(os.path.getmtime(filename))
+        """YYYYMMDD_HHMMSS key - sorts chronologically as a plain string"""
+        match = PREDICTION_FILE_RE.search(os.path.basename(filename))
+        if match:
+            return match.group(2)  # "20250720_211607"
+        # Fallback to file modification time, in the same format
+        return time.strftime('%Y%m%d_%H%M%S', time.localtime(os.path.getmtime(filename)))
     
-    return max(prediction_files, key=extract_model_timestamp)
+    # Same model timestamp in both formats: prefer the Parquet copy
+    return max(prediction_files, key=lambda f: (extract_model_timestamp(f), f.endswith('.parquet')))
 
 def extract_model_info_from_filename(filename):
     """Extract detailed model information from filename"""
     try:
-        # Pattern: lead_scores_1753049562162_20250720_211607.csv
-        pattern = r'lead_scores_(\d+)_(\d{8}_\d{6})\.csv'
-        match = re.search(pattern, os.path.basename(filename))
+        match = PREDICTION_FILE_RE.search(os.path.basename(filename))
         
         if match:
             unix_timestamp = match.group(1)
@@ -108,16 +317,16 @@ def extract_model_info_from_filename(filename):
             }
             
     except Exception as e:
-        print(f"Error extracting model info: {e}")
+        logger.error("Error extracting model info: %s", e)
         return {
             'unix_timestamp': None,
             'model_timestamp': None,
             'model_version': 'Unknown'
         }
 
-def calculate_prediction_stats(predictions):
-    """Calculate summary statistics for predictions"""
-    if not predictions:
+def calculate_prediction_stats(probabilities, labels):
+    """Calculate summary statistics from the probability and label columns"""
+    if probabilities.shape[0] == 0:
         return {
             'total_predictions': 0,
             'positive_predictions': 0,
@@ -128,11 +337,9 @@ def calculate_prediction_stats(predictions):
             'high_probability_percentage': 0
         }
     
-    total = len(predictions)
-    positive = sum(1 for p in predictions if p.get('prediction', 0) == 1)
+    total, positive, high_prob, prob_sum = summarize_predictions(probabilities, labels)
     negative = total - positive
-    high_prob = sum(1 for p in predictions if p.get('probability', 0) > 0.7)
-    avg_prob = sum(p.get('probability', 0) for p in predictions) / total if total > 0 else 0
+    avg_prob = prob_sum / total if total > 0 else 0
     
     return {
         'total_predictions': total,
@@ -0,0 +1,83 @@
+import json
+from collections.abc import Mapping
+from datetime import date
+
+import numpy as np
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    orjson = None  # orjson is optional - fall back to the stdlib encoder
+
+
+def json_default(obj):
+    """Encode the non-native types our payloads carry (numpy scalars, pandas timestamps, read-only mappings)"""
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj):
+    """Serialize obj to UTF-8 encoded JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=json_default, option=ORJSON_OPTIONS)
+    return json.dumps(obj, default=json_default).encode('utf-8')
+
+def loads(data):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_response(payload, status=200):
+    """Build a JSON response without going through jsonify"""
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson when it is installed"""
+
+    @staticmethod
+    def default(obj):
+        # Stdlib fallback path: our numpy/mapping types first, then Flask's (dates, UUIDs, ...)
+        try:
+            return json_default(obj)
+        except TypeError:
+            return DefaultJSONProvider.default(obj)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        # Hand the encoded bytes straight to the response - no str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
+
+
+class SocketIOJSON:
+    """json module stand-in for python-socketio (it passes stdlib kwargs and expects str)"""
+
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        return dumps(obj).decode('utf-8')
+
+    @staticmethod
+    def loads(data, *args, **kwargs):
+        return loads(data)
@@ -0,0 +1,15 @@
+"""
+Production entrypoint for gunicorn with eventlet workers:
+
+    gunicorn --chdir app -k eventlet -w 1 --worker-connections 1000 -b 0.0.0.0:5000 wsgi:app
+
+Socket.IO keeps per-client session state in the worker, so a single worker is
+required unless a message queue and sticky sessions are configured.
+"""
+import os
+
+os.environ.setdefault('SOCKETIO_ASYNC_MODE', 'eventlet')
+
+from api import app, socketio, warmup  # noqa: E402
+
+warmup()
@@ -1,120 +1,118 @@
 import os
 import json
+import numpy as np
 import pandas as pd
 import time  # ← ADDED MISSING IMPORT
-from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional
 
 
+# HubSpot property mappings (actual HubSpot field names), first non-empty field wins
+HUBSPOT_MAPPINGS = {
+    'lead_id': ['id', 'hs_object_id'],  # HubSpot record ID
+    'firstname': ['firstname', 'first_name'],
+    'lastname': ['lastname', 'last_name'],
+    'email': ['email'],
+    'company_size': ['num_employees', 'company_size', 'numberofemployees'],
+    'source': ['hs_analytics_source', 'source', 'lead_source'],
+    'region': ['country', 'state', 'region'],
+    'contact_attempts': ['num_contacted_notes', 'contact_attempts', 'num_times_contacted'],
+    'days_since_first_contact': ['createdate', 'first_contact_date', 'days_since_first_contact'],
+    'job_title': ['jobtitle', 'job_title'],
+    'has_company_website': ['website', 'company_website', 'has_company_website']
+}
+
+# Enhanced conversion logic for labeled leads
+CONVERTED_LIFECYCLE_STAGES = ["customer", "opportunity", "qualified-to-buy"]
+CONVERTED_LEAD_STATUSES = ["CONNECTED", "QUALIFIED", "CONVERTED"]
+
+FALSE_VALUES = ['false', '0', 'no', 'off']
+MS_PER_DAY = 86_400_000
+
+# Resolved once at import instead of per adapter instance
+ADAPTED_DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'adapted'))
+LAST_FETCH_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'last_fetch_timestamp.json'))
+
+
 class HubSpotDataAdapter:
     """Adapter class to transform HubSpot fetched data into CSV format."""
     
     def __init__(self):
-        self.data_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'adapted')
-        self.last_fetch_tmp = os.path.join(os.path.dirname(__file__), '..', '..', 'config','last_fetch_timestamp.json')
+        self.data_dir = ADAPTED_DATA_DIR
+        self.last_fetch_tmp = LAST_FETCH_FILE
         # Create directory if it doesn't exist
         os.makedirs(self.data_dir, exist_ok=True)
     
-    def extract_lead_properties(self, properties: Dict) -> Dict:
-        """Extract and transform HubSpot properties to standardized format"""
-        
-        # HubSpot property mappings (actual HubSpot field names)
-        hubspot_mappings = {
-            'lead_id': ['id', 'hs_object_id'],  # HubSpot record ID
-            'firstname': ['firstname', 'first_name'],
-            'lastname': ['lastname', 'last_name'],
-            'email': ['email'],
-            'company_size': ['num_employees', 'company_size', 'numberofemployees'],
-            'source': ['hs_analytics_source', 'source', 'lead_source'],
-            'region': ['country', 'state', 'region'],
-            'contact_attempts': ['num_contacted_notes', 'contact_attempts', 'num_times_contacted'],
-            'days_since_first_contact': ['createdate', 'first_contact_date', 'days_since_first_contact'],
-            'job_title': ['jobtitle', 'job_title'],
-            'has_company_website': ['website', 'company_website', 'has_company_website']
-        }
-        
-        extracted = {}
-        
-        for standard_field, hubspot_fields in hubspot_mappings.items():
-            value = None
-            
-            # Try each possible HubSpot field name
-            for field in hubspot_fields:
-                if field in properties and properties[field]:
-                    value = properties[field]
-                    break
+    def extract_leads_frame(self, properties_df: pd.DataFrame, now: Optional[float] = None) -> pd.DataFrame:
+        """Extract and transform HubSpot properties to the standardized columns, a whole batch at once"""
+        leads = pd.DataFrame(index=properties_df.index)
+        
+        for standard_field, hubspot_fields in HUBSPOT_MAPPINGS.items():
+            value = self.first_present(properties_df, hubspot_fields)
             
-            # Apply data type conversions
-            if standard_field == 'lead_id':
-                extracted[standard_field] = str(value) if value else ''
-            elif standard_field in ['contact_attempts']:
-                extracted[standard_field] = self.safe_int_conversion(value)
-            elif standard_field in ['days_since_first_contact']:
-                extracted[standard_field] = self.calculate_days_since_contact(value)
-            elif standard_field in ['has_company_website']:
-                extracted[standard_field] = self.safe_bool_conversion(value)
+            # Apply data type conversions once per column
+            if standard_field == 'contact_attempts':
+                leads[standard_field] = self.to_int_column(value)
+            elif standard_field == 'days_since_first_contact':
+                leads[standard_field] = self.days_since_column(value, now)
+            elif standard_field == 'has_company_website':
+                leads[standard_field] = self.to_bool_column(value)
             else:
-                extracted[standard_field] = str(value) if value else ''
+                leads[standard_field] = value.fillna('').astype(str)
         
-        return extracted
+        return leads.reset_index(drop=True)
     
-    def safe_int_conversion(self, value) -> int:
-        """Safely convert value to integer"""
-        if value is None or value == '':
-            return 0
-        try:
-            return int(float(str(value)))
-        except (ValueError, TypeError):
-            return 0
+    def first_present(self, properties_df: pd.DataFrame, fields: List[str]) -> pd.Series:
+        """Per row, the value of the first field that is set and non-empty (None otherwise)"""
+        value = pd.Series(None, index=properties_df.index, dtype=object)
+        # Walk the candidates backwards so earlier fields overwrite later ones
+        for field in reversed(fields):
+            if field in properties_df.columns:
+                column = properties_df[field]
+                present = column.notna() & (column.astype(str) != '')
+                value = column.where(present, value)
+        return value
     
-    def safe_bool_conversion(self, value) -> int:
-        """Convert value to boolean (1/0 for CSV compatibility)"""
-        if value is None or value == '':
-            return 0
-        
-        # Handle different boolean representations
-        if isinstance(value, bool):
-            return 1 if value else 0
-        
-        str_value = str(value).lower()
-        if str_value in ['true', '1', 'yes', 'on']:
-            return 1
-        elif str_value in ['false', '0', 'no', 'off']:
-            return 0
-        else:
-            # If it's a URL or any non-empty string, consider it as having a website
-            return 1 if str_value.strip() else 0
+    def to_int_column(self, value: pd.Series) -> pd.Series:
+        """Integer column (truncates toward zero, 0 when not numeric)"""
+        numbers = pd.to_numeric(value.astype(str), errors='coerce')
+        numbers = numbers.where(np.isfinite(numbers), 0)
+        return numbers.astype('int64')
     
-    def calculate_days_since_contact(self, value) -> int:
-        """Calculate days since first contact"""
-        if value is None or value == '':
-            return 0
-        
-        try:
-            # If it's already a number of days
-            if isinstance(value, (int, float)):
-                return int(value)
-            
-            # If it's a timestamp (milliseconds)
-            if str(value).isdigit() and len(str(value)) == 13:
-                contact_date = datetime.fromtimestamp(int(value) / 1000)
-                days_diff = (datetime.now() - contact_date).days
-                return max(0, days_diff)
-            
-            # If it's a date string
-            if isinstance(value, str):
-                try:
-                    contact_date = datetime.strptime(value, '%Y-%m-%d')
-                    days_diff = (datetime.now() - contact_date).days
-                    return max(0, days_diff)
-                except ValueError:
-                    pass
-            
-            return 0
-        except (ValueError, TypeError):
-            return 0
+    def to_bool_column(self, value: pd.Series) -> pd.Series:
+        """Boolean column as 1/0 for CSV compatibility"""
+        text = value.fillna('').astype(str).str.lower()
+        # Anything non-empty that is not an explicit "false" (URLs included) counts as 1
+        return (~(text.isin(FALSE_VALUES) | (text.str.strip() == ''))).astype('int64')
+    
+    def days_since_column(self, value: pd.Series, now: Optional[float] = None) -> pd.Series:
+        """Days since first contact from day counts, millisecond timestamps or YYYY-MM-DD dates"""
+        days = pd.Series(0, index=value.index, dtype='int64')
+        text = value.astype(str)
+        # One clock reading (epoch seconds) for the whole batch, shared by both paths below
+        if now is None:
+            now = time.time()
+        
+        # Already a number of days
+        is_number = value.map(type).isin((int, float, bool))
+        days[is_number] = value[is_number].astype(float).astype('int64')
+        
+        # Millisecond epoch timestamps
+        is_millis = ~is_number & text.str.fullmatch(r'\d{13}')
+        if is_millis.any():
+            elapsed = int(now * 1000) - text[is_millis].astype('int64')
+            days[is_millis] = (elapsed // MS_PER_DAY).clip(lower=0)
+        
+        # Plain YYYY-MM-DD date strings; anything else stays 0
+        is_date = ~is_number & ~is_millis & value.notna()
+        if is_date.any():
+            dates = pd.to_datetime(text[is_date], format='%Y-%m-%d', errors='coerce')
+            elapsed = (pd.Timestamp.fromtimestamp(now) - dates).dt.days
+            days[is_date] = elapsed.clip(lower=0).fillna(0).astype('int64')
+        
+        return days
     
-    def transform_labeled_data(self, labeled_data: Dict) -> pd.DataFrame:
+    def transform_labeled_data(self, labeled_data: Dict, now: Optional[float] = None) -> pd.DataFrame:
         """Transform labeled data from HubSpot API response to DataFrame."""
         
         if not labeled_data or 'results' not in labeled_data:
@@ -124,36 +122,26 @@ class HubSpotDataAdapter:
                 'contact_attempts','days_since_first_contact','job_title','has_company_website','converted'
             ])
         
-        contacts_list = []
+        properties_df = pd.DataFrame([contact.get('properties', {}) for contact in labeled_data['results']], dtype=object)
         
-        for contact in labeled_data['results']:
-            properties = contact.get('properties', {})
-            
-            # Extract standardized properties
-            contact_data = self.extract_lead_properties(properties)
-            
-            # Determine converted value based on lifecyclestage and hs_lead_status
-            lifecyclestage = properties.get('lifecyclestage', '')
-            hs_lead_status = properties.get('hs_lead_status', '')
-            
-            # Enhanced conversion logic
-            converted = 0  # Default value
-            
-            if lifecyclestage in ["customer", "opportunity", "qualified-to-buy"]:
-                converted = 1
-            elif hs_lead_status in ["CONNECTED", "QUALIFIED", "CONVERTED"]:
-                converted = 1
-            elif hs_lead_status in ["UNQUALIFIED", "DISQUALIFIED", "INVALID"]:
-                converted = 0
-            
-            contact_data['converted'] = converted
-            contacts_list.append(contact_data)
+        # Extract standardized properties column-wise
+        df = self.extract_leads_frame(properties_df, now)
+        
+        # Determine converted value based on lifecyclestage and hs_lead_status
+        # (UNQUALIFIED / DISQUALIFIED / INVALID and anything unknown stay 0)
+        missing = pd.Series('', index=properties_df.index, dtype=object)
+        lifecyclestage = properties_df.get('lifecyclestage', missing)
+        hs_lead_status = properties_df.get('hs_lead_status', missing)
+        converted = (
+            lifecyclestage.isin(CONVERTED_LIFECYCLE_STAGES) |
+            hs_lead_status.isin(CONVERTED_LEAD_STATUSES)
+        )
         
-        df = pd.DataFrame(contacts_list)
+        df['converted'] = converted.to_numpy().astype('int8')
         print(f" Transformed {len(df)} labeled contacts")
         return df
     
-    def transform_unlabeled_data(self, unlabeled_data: Dict) -> pd.DataFrame:
+    def transform_unlabeled_data(self, unlabeled_data: Dict, now: Optional[float] = None) -> pd.DataFrame:
         """Transform unlabeled data from HubSpot API response to DataFrame."""
         
         if not unlabeled_data or 'results' not in unlabeled_data:
@@ -164,22 +152,21 @@ class HubSpotDataAdapter:
                 'job_title', 'has_company_website'
             ])
         
-        contacts_list = []
-        
-        for contact in unlabeled_data['results']:
-            properties = contact.get('properties', {})
-            
-            # Extract standardized properties
-            contact_data = self.extract_lead_properties(properties)
-            contacts_list.append(contact_data)
+        properties_df = pd.DataFrame([contact.get('properties', {}) for contact in unlabeled_data['results']], dtype=object)
         
-        df = pd.DataFrame(contacts_list)
+        # Extract standardized properties column-wise
+        df = self.extract_leads_frame(properties_df, now)
         print(f" Transformed {len(df)} unlabeled contacts")
         return df
     
-    def save_to_csv(self, df: pd.DataFrame, filename: str) -> Optional[str]:
+    def save_to_csv(self, df: pd.DataFrame, filename: str, timestamp: Optional[int] = None) -> Optional[str]:
         """Save DataFrame to CSV with proper timestamp handling"""
         
+        # Fetch scripts pass the start of the fetch that produced df, which also becomes the
+        # checkpoint - so the file name and last_fetch_* always agree
+        if timestamp is not None:
+            return self.write_csv(df, filename, timestamp)
+        
         # Get timestamp from the last fetch file
         try:
             with open(self.last_fetch_tmp, 'r') as f:
@@ -200,7 +187,11 @@ class HubSpotDataAdapter:
             print(f"Error loading last fetch timestamp: {e}")
             # Fallback to current timestamp in milliseconds
             timestamp = int(time.time() * 1000)  # ← FIXED: Consistent format
-            
+        
+        return self.write_csv(df, filename, timestamp)
+    
+    def write_csv(self, df: pd.DataFrame, filename: str, timestamp: int) -> Optional[str]:
+        """Write df as {filename}_{timestamp}.csv in the adapted data directory"""
         filename_with_timestamp = f"{filename}_{timestamp}.csv"
         filepath = os.path.join(self.data_dir, filename_with_timestamp)
         
@@ -231,23 +222,31 @@ class HubSpotDataAdapter:
             print(f" Error saving CSV: {e}")
             return None
 
-    def process_all_data(self, data, type) -> List[str]:
-        """Process and save data based on type"""
+    def process_all_data(self, data, type, fetch_timestamp=None) -> List[str]:
+        """Process and save data based on type (files named after fetch_timestamp when given)"""
         
         saved_files = []
+        # Every day count in this run is measured from the same instant
+        now = time.time()
         
         # Transform data
         if type == "labeled":
-            labeled_df = self.transform_labeled_data(data)
+            labeled_df = self.transform_labeled_data(data, now)
             # Always save, even if empty
-            filepath = self.save_to_csv(labeled_df, "labeled_leads")
+            filepath = self.save_to_csv(labeled_df, "labeled_leads", fetch_timestamp)
             if filepath:
                 saved_files.append(filepath)
         elif type == "unlabeled":
-            unlabeled_df = self.transform_unlabeled_data(data)
+            unlabeled_df = self.transform_unlabeled_data(data, now)
             # Always save, even if empty
-            filepath = self.save_to_csv(unlabeled_df, "unlabeled_leads")
+            filepath = self.save_to_csv(unlabeled_df, "unlabeled_leads", fetch_timestamp)
             if filepath:
                 saved_files.append(filepath)
         
-        return saved_files
\ No newline at end of file
+        return saved_files
+
+
+@lru_cache(maxsize=None)
+def get_data_adapter() -> HubSpotDataAdapter:
+    """Process-wide adapter - it holds no per-run state, so one construction is enough"""
+    return HubSpotDataAdapter()
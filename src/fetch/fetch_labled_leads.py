@@ -1,3 +1,4 @@
+import logging
 import os
 import sys
 
@@ -6,15 +7,15 @@ current_dir = os.path.dirname(__file__)
 sys.path.append(current_dir)
 
 from hubSpot import HubSpotLeadFetcher
-from hubSpot import get_access_token_from_file, check_for_last_fetch
+from hubSpot import get_access_token_from_file, check_for_last_fetch, update_last_fetch_timestamp
 
 # Add adapter directory to path
 adapter_dir = os.path.join(current_dir, '..', 'adapter')
 sys.path.append(adapter_dir)
-from adapt_fetched_data import HubSpotDataAdapter
+from adapt_fetched_data import get_data_adapter
 
 
-TOKEN_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'hubspot_token.json')
+TOKEN_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'hubspot_token.json'))
 
 def main():
     try:
@@ -25,7 +26,7 @@ def main():
             print(f"Error reading access token from file: {e}")
             return
 
-        fetcher = HubSpotLeadFetcher(access_token)
+        fetcher = HubSpotLeadFetcher(access_token, token_file=TOKEN_FILE)
         time = check_for_last_fetch()
         
         time_labled = time['last_fetch_labeled']
@@ -71,8 +72,13 @@ def main():
         
         # Process and save data using the adapter
         print(" Processing and saving labeled data...")
-        adapter = HubSpotDataAdapter()
-        saved_files = adapter.process_all_data(labled_response, type="labeled")
+        adapter = get_data_adapter()
+        saved_files = adapter.process_all_data(labled_response, type="labeled", fetch_timestamp=fetcher.fetch_started_at)
+        
+        # Single checkpoint per run, only after the data is safely on disk - it names the
+        # file just written
+        if saved_files:
+            update_last_fetch_timestamp("labeled", fetcher.fetch_started_at)
         
         # Count total leads processed
         total_leads = 0
@@ -92,5 +98,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Surface the fetcher's progress lines (logger.info) on the console
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     result = main()
     print(f"Fetched {result} labeled leads")
\ No newline at end of file
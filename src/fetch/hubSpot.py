@@ -1,31 +1,132 @@
 import os
 import json
-#import time
+import logging
+import threading
+import time
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    orjson = None  # orjson is optional - fall back to the stdlib parser
+    json_loads = json.loads
 from datetime import datetime
 from dotenv import load_dotenv
-from datetime import datetime
-import sys
-
-# Add the adapter directory to the path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'adapter'))
 
 load_dotenv()
-LAST_FETCH= os.path.join(os.path.dirname(__file__),'..','..','config','last_fetch_timestamp.json')
+logger = logging.getLogger(__name__)
+# Canonical absolute path: normalized once, and one stable key for the config cache
+LAST_FETCH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'last_fetch_timestamp.json'))
+
+# Contact properties requested by default - built once, serialized as a JSON list
+LEAD_PROPERTIES = (
+    "lead_id", "firstname", "lastname", "email", "lifecyclestage", "hs_lead_status", "company_size",
+    "source", "region", "contact_attempts", "days_since_first_contact", "job_title", "has_company_website"
+)
+
+# Refresh the access token this many seconds before HubSpot would reject it
+TOKEN_REFRESH_MARGIN = 60
+
+# (connect, read) seconds for every HubSpot call
+REQUEST_TIMEOUT = (3.05, 30)
+
+# One pooled keep-alive session per process: the TLS handshake to api.hubapi.com is paid
+# once, not per call. Rate-limit and gateway errors are retried with backoff.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=["POST"],
+        raise_on_status=False
+    )
+))
+
+class RateLimiter:
+    """Token bucket allowing `rate` calls per `per` seconds, shared by every fetcher thread"""
+
+    def __init__(self, rate, per):
+        self.rate = rate
+        self.per = per
+        self.allowance = rate
+        self.last_check = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call may go out without tripping HubSpot's rate limit"""
+        with self.lock:
+            now = time.monotonic()
+            self.allowance = min(self.rate, self.allowance + (now - self.last_check) * self.rate / self.per)
+            self.last_check = now
+            if self.allowance >= 1:
+                self.allowance -= 1
+                return
+            # Sleep exactly until one token has accrued, then spend it
+            wait = (1 - self.allowance) * self.per / self.rate
+            time.sleep(wait)
+            self.allowance = 0
+            self.last_check = now + wait
+
+# HubSpot allows 10 requests/second per app; stay just under it unless told otherwise
+RATE_LIMITER = RateLimiter(
+    float(os.environ.get("HUBSPOT_RATE", 9)),
+    float(os.environ.get("HUBSPOT_PER", 1.0))
+)
+
+# path -> (st_mtime_ns, parsed data) for the small token/timestamp JSON files
+_config_cache = {}
+
 
+def load_json_cached(path):
+    """Parse a JSON config file once and reuse it until its mtime changes"""
+    mtime = os.stat(path).st_mtime_ns
+    entry = _config_cache.get(path)
+    if entry is not None and entry[0] == mtime:
+        return entry[1]
+    with open(path, 'rb') as f:
+        data = json_loads(f.read())
+    _config_cache[path] = (mtime, data)
+    return data
 
+def save_json_cached(path, data, indent=None):
+    """Atomically write a JSON config file and update its cache entry in place"""
+    # Serialize once and write once (json.dump issues a write per token); compact unless asked
+    if indent:
+        raw = json.dumps(data, indent=indent).encode('utf-8')
+    elif orjson is not None:
+        raw = orjson.dumps(data)
+    else:
+        raw = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    # Per-process temp name: the labeled and unlabeled cron scripts may save the same file at once
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(raw)
+    # Readers see the old file or the new one, never a partial write
+    os.replace(tmp_path, path)
+    _config_cache[path] = (os.stat(path).st_mtime_ns, data)
+
+def default_fetch_timestamps():
+    """First-run checkpoints: look back 30 days for the initial comprehensive fetch"""
+    thirty_days_ago = int((time.time() - (30 * 24 * 60 * 60)) * 1000)
+    return {
+        "last_fetch_labeled": thirty_days_ago,
+        "last_fetch_unlabeled": thirty_days_ago
+    }
 
 def get_access_token_from_file(TOKEN_FILE):
   
-    with open(TOKEN_FILE, "r") as f:
-        data = json.load(f)
+    data = load_json_cached(TOKEN_FILE)
     return data["access_token"]
 
-def check_for_last_fetch():
+def check_for_last_fetch(create_if_missing=False):
+    """Read the last-fetch checkpoints; optionally write 30-day defaults when missing or corrupt"""
     try:
-        with open(LAST_FETCH, 'r') as f:
-            data = json.load(f)
+        data = load_json_cached(LAST_FETCH)
         # Handle both old format (single timestamp) and new format (separate timestamps)
         if isinstance(data, dict):
             return data
@@ -37,21 +138,28 @@ def check_for_last_fetch():
             }
     except FileNotFoundError:
         print("Last fetch timestamp file not found. This might be the first run.")
-        return {
-            "last_fetch_labeled": None,
-            "last_fetch_unlabeled": None
-        }
+        if create_if_missing:
+            # Create config directory if it doesn't exist
+            os.makedirs(os.path.dirname(LAST_FETCH), exist_ok=True)
     except json.JSONDecodeError as e:
         print(f"Error parsing last fetch timestamp: {e}")
+    
+    if not create_if_missing:
         return {
             "last_fetch_labeled": None,
             "last_fetch_unlabeled": None
-        }  
+        }
+    
+    # Written atomically, so a crash here cannot leave another corrupt file behind
+    timestamps = default_fetch_timestamps()
+    save_json_cached(LAST_FETCH, timestamps)
+    print("Created timestamp file with 30-day lookback period")
+    return timestamps
     
 def update_last_fetch_timestamp(data_type, timestamp):
     try:
-        # Read existing data
-        existing_data = check_for_last_fetch()
+        # Read existing data (copied - the parsed dict is shared through the cache)
+        existing_data = dict(check_for_last_fetch())
         
         #Clean up any old typos and normalize to correct spelling
         if "last_fetch_labled" in existing_data:
@@ -66,8 +174,7 @@ def update_last_fetch_timestamp(data_type, timestamp):
         existing_data[key] = timestamp
         
         # Write back to file
-        with open(LAST_FETCH, 'w') as f:
-            json.dump(existing_data, f, indent=2)
+        save_json_cached(LAST_FETCH, existing_data)
             
         
     except Exception as e:
@@ -76,7 +183,7 @@ def update_last_fetch_timestamp(data_type, timestamp):
 class HubSpotLeadFetcher:
     """Class to fetch leads from HubSpot CRM using OAuth."""
 
-    def __init__(self, access_token=None):
+    def __init__(self, access_token=None, properties=None, token_file=None):
        
         self.access_token = access_token or os.environ.get("HUBSPOT_ACCESS_TOKEN")
         if not self.access_token:
@@ -87,51 +194,89 @@ class HubSpotLeadFetcher:
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json"
         }
+        # Auth headers stay per request: the token endpoint posts a form body on the same session
+        self.session = _SESSION
+        self.limiter = RATE_LIMITER
+        # Callers that only need a few fields can ask for less per contact
+        self.properties = tuple(properties) if properties else LEAD_PROPERTIES
+        # Start time of the last fetch_leads call - callers checkpoint it once the data is saved
+        self.fetch_started_at = None
+        
+        # Monotonic deadline for the current token; None when unknown (the 401 retry still applies)
+        self.token_file = token_file
+        self.expires_at = None
+        if token_file:
+            try:
+                expires_in = int(load_json_cached(token_file).get("expires_in", 1800))
+                issued_ago = time.time() - os.path.getmtime(token_file)
+                self.expires_at = time.monotonic() + expires_in - issued_ago - TOKEN_REFRESH_MARGIN
+            except (OSError, ValueError, TypeError):
+                pass
 
+    def ensure_fresh_token(self):
+        """Refresh just before expiry instead of discovering it through a failed request"""
+        if self.expires_at is not None and time.monotonic() >= self.expires_at:
+            self.refresh_token(self.token_file)
  
     
-    def fetch_leads(self,time,filter_groups,data_type):
-        
-        url = f"{self.base_url}/crm/v3/objects/contacts/search"
-        
-        
-        
-        if time:
-            readable_time = datetime.fromtimestamp(time / 1000).strftime('%Y-%m-%d %H:%M:%S')
-            print(f" Filtering for contacts modified after: {readable_time}")
+    def build_search_payload(self, since, filter_groups):
+        """Search body for contacts matching filter_groups and modified after `since` (ms)"""
+        if since:
+            # Only build the datetime when the line will actually be emitted
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Filtering for contacts modified after: %s", datetime.fromtimestamp(since / 1000).isoformat(sep=' '))
             
-            for filter_group in filter_groups:
-                filter_group["filters"].append({
-                    "propertyName": "lastmodifieddate",
-                    "operator": "GT",
-                    "value": str(time)
-                })
-        payload = {
+            # Extend copies, not the caller's groups - a retry after 401 must not stack a second filter
+            modified_filter = {
+                "propertyName": "lastmodifieddate",
+                "operator": "GT",
+                "value": str(since)
+            }
+            filter_groups = [
+                {**filter_group, "filters": filter_group["filters"] + [modified_filter]}
+                for filter_group in filter_groups
+            ]
+        return {
             "filterGroups": filter_groups,
-               
-            
-            "properties": [
-                "lead_id","firstname", "lastname", "email", "lifecyclestage", "hs_lead_status", "company_size", "source","region","contact_attempts","days_since_first_contact","job_title","has_company_website"
-            ],
+            "properties": self.properties,
             "limit": 100
         }
-
+    
+    def fetch_leads(self,since,filter_groups,data_type):
+        
+        url = f"{self.base_url}/crm/v3/objects/contacts/search"
+        self.ensure_fresh_token()
+        # Taken before the first page so contacts modified mid-fetch are picked up next run
+        self.fetch_started_at = time.time_ns() // 1_000_000
         
+        
+        payload = self.build_search_payload(since, filter_groups)
             
+        # Search returns at most 100 contacts per call; follow paging.next.after until it runs out.
+        # The cursor comes from the previous page, so pages are fetched one after another.
+        results = []
         try:
-            response = requests.post(url, headers=self.headers ,json=payload)
-            
-            response.raise_for_status()
-             
-           
-            try:
+            while True:
+                self.limiter.acquire()
+                response = self.session.post(url, headers=self.headers, json=payload, timeout=REQUEST_TIMEOUT)
+                
+                response.raise_for_status()
                 
-                data = response.json()
-                current_timestamp = int(datetime.now().timestamp() * 1000)
-                update_last_fetch_timestamp(data_type, current_timestamp)
-            except ValueError as json_error:
-                print(f"Invalid JSON response , error message: {json_error}, data : {data}")
-                return []
+                try:
+                    
+                    # Parse the body bytes directly (orjson.JSONDecodeError is a ValueError)
+                    page = json_loads(response.content)
+                except ValueError as json_error:
+                    print(f"Invalid JSON response , error message: {json_error}")
+                    return []
+                
+                results.extend(page.get("results", []))
+                after = page.get("paging", {}).get("next", {}).get("after")
+                if not after:
+                    break
+                payload["after"] = after
+            
+            data = {"total": page.get("total", len(results)), "results": results}
         except requests.exceptions.HTTPError as httpError:
             print(f"PROBLEM while fetch Data: {httpError.response}")
             return httpError.response.status_code
@@ -145,8 +290,7 @@ class HubSpotLeadFetcher:
         """Refresh the OAuth token using refresh_token"""
         try:
             # Read current token data
-            with open(TOKEN_FILE, 'r') as f:
-                token_data = json.load(f)
+            token_data = load_json_cached(TOKEN_FILE)
             
             refresh_token = token_data.get('refresh_token')
             if not refresh_token:
@@ -162,30 +306,28 @@ class HubSpotLeadFetcher:
                 "refresh_token": refresh_token
             }
             
-            response = requests.post(token_url, data=data)
+            self.limiter.acquire()
+            response = self.session.post(token_url, data=data, timeout=REQUEST_TIMEOUT)
             if response.status_code != 200:
                 print(f" Token refresh failed: {response.text}")
                 return False
                 
-            new_token_data = response.json()
+            new_token_data = json_loads(response.content)
             
             # Preserve refresh token if not returned
             if 'refresh_token' not in new_token_data:
                 new_token_data['refresh_token'] = refresh_token
                 
             # Update stored token
-            with open(TOKEN_FILE, 'w') as f:
-                json.dump(new_token_data, f, indent=4)
+            save_json_cached(TOKEN_FILE, new_token_data, indent=4)
                 
             # Update instance token
             self.access_token = new_token_data['access_token']
             self.headers["Authorization"] = f"Bearer {self.access_token}"
+            self.expires_at = time.monotonic() + int(new_token_data.get("expires_in", 1800)) - TOKEN_REFRESH_MARGIN
             
             return True
             
         except Exception as e:
             print(f" Error during token refresh: {e}")
             return False
-    
-
-
@@ -1,48 +1,243 @@
+import atexit
+import io
+import itertools
+import logging
 import os
+import struct
+import sys
+import zlib
 import json
+import threading
+from collections import OrderedDict, defaultdict, deque
 import numpy as np
 import pandas as pd
 import time
-import random
 import math
 from datetime import datetime
 
-# Configuration for MAB tracking only
-MONITORING_LOG = os.path.join(os.path.dirname(__file__), '..', '..', 'metadata', 'monitoring_log.jsonl')
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
-def baseLine_stats(probabilities):
+try:
+    import orjson
+except ImportError:
+    orjson = None  # orjson is optional - fall back to the stdlib encoder/parser
+
+logger = logging.getLogger(__name__)
+
+# Configuration for MAB tracking only - paths resolved once at import
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+METADATA_DIR = os.path.join(PROJECT_ROOT, 'metadata')
+MONITORING_LOG = os.path.join(METADATA_DIR, 'monitoring_log.jsonl')
+PERFORMANCE_FILE = os.path.join(METADATA_DIR, 'model_performance.json')
+CONVERSION_LOG = os.path.join(METADATA_DIR, 'conversions.jsonl')
+CONVERSION_BIN_LOG = os.path.join(METADATA_DIR, 'conversions.bin')
+CONVERSION_MODELS_FILE = os.path.join(METADATA_DIR, 'conversion_models.json')
+MODELS_VERSION_FILE = os.path.join(PROJECT_ROOT, 'config', 'models_version.json')
+MODELS_DIR = os.path.join(PROJECT_ROOT, 'models')
+
+# Every log and the performance file live in metadata/ - create it once here, not before each write
+os.makedirs(METADATA_DIR, exist_ok=True)
+
+# One generator for the whole process - seeded once, reused by every sampling call
+RNG = np.random.default_rng()
+
+# Uniform draws for model selection, generated in blocks and handed out one at a time
+UNIFORM_BUFFER_SIZE = 1024
+_uniform_buffer = RNG.random(UNIFORM_BUFFER_SIZE)
+_uniform_index = 0
+_uniform_lock = threading.Lock()
+
+def next_uniform():
+    """Next uniform [0, 1) draw from the pre-generated buffer, refilled when drained"""
+    global _uniform_buffer, _uniform_index
+    with _uniform_lock:
+        if _uniform_index >= UNIFORM_BUFFER_SIZE:
+            _uniform_buffer = RNG.random(UNIFORM_BUFFER_SIZE)
+            _uniform_index = 0
+        value = _uniform_buffer[_uniform_index]
+        _uniform_index += 1
+    return float(value)
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def thompson_wins(alpha, beta, num_samples):
+        """Win count per model over num_samples Beta draws, without materializing the sample matrix"""
+        num_models = alpha.shape[0]
+        wins = np.zeros(num_models, dtype=np.int64)
+        for _ in range(num_samples):
+            best = -1.0
+            best_index = 0
+            for i in range(num_models):
+                sample = np.random.beta(alpha[i], beta[i])
+                if sample > best:
+                    best = sample
+                    best_index = i
+            wins[best_index] += 1
+        return wins
+else:
+    def thompson_wins(alpha, beta, num_samples):
+        """NumPy fallback: win count per model over num_samples Beta draws"""
+        # Row i is sample i, column j is model j; the row argmax is that sample's winner
+        samples = RNG.beta(alpha, beta, size=(num_samples, alpha.shape[0]))
+        return np.bincount(samples.argmax(axis=1), minlength=alpha.shape[0])
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def mean_std(x):
+        """Mean and population std in a single Welford pass"""
+        n = x.shape[0]
+        if n == 0:
+            return np.nan, np.nan
+        m = 0.0
+        m2 = 0.0
+        for i in range(n):
+            d = x[i] - m
+            m += d / (i + 1)
+            m2 += d * (x[i] - m)
+        return m, math.sqrt(m2 / n)
+else:
+    def mean_std(x):
+        """NumPy fallback: mean and population std"""
+        return x.mean(), x.std()
+
+BASELINE_QUANTILES = np.array([0.1, 0.25, 0.5, 0.75, 0.9])
+
+def numpy_default(obj):
+    """JSON fallback for numpy scalars and arrays in the monitoring stats"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def json_dumps_bytes(obj, indent=False):
+    """Serialize to UTF-8 JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=numpy_default, option=option)
+    return json.dumps(obj, default=numpy_default, indent=2 if indent else None).encode('utf-8')
+
+json_loads = orjson.loads if orjson is not None else json.loads
+
+def write_json_atomic(path, obj, indent=False):
+    """Encode obj fully in memory, write it with one call to a temp file, then rename it over path"""
+    data = json_dumps_bytes(obj, indent=indent)
+    # Per-process temp name so concurrent workers never write into each other's file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def baseLine_stats(probabilities, level='full'):
     """Calculate basic statistics for probability distribution (for MAB tracking only)"""
+    values = np.ascontiguousarray(probabilities, dtype=np.float64)
+    mean, std = mean_std(values)
+    if level == 'basic':
+        # Single pass only - no selection for the median/percentiles
+        return {'mean': mean, 'std': std, 'count': len(values)}
+    # One selection pass for all five quantiles instead of a median plus four percentile calls
+    p10, p25, median, p75, p90 = np.quantile(values, BASELINE_QUANTILES)
     return {
-        'mean': np.mean(probabilities),
-        'median': np.median(probabilities),
-        'std': np.std(probabilities),
-        'count': len(probabilities),
+        'mean': mean,
+        'median': median,
+        'std': std,
+        'count': len(values),
         'percentiles': {
-            'p10': np.percentile(probabilities, 10),
-            'p25': np.percentile(probabilities, 25),
-            'p75': np.percentile(probabilities, 75),
-            'p90': np.percentile(probabilities, 90)
+            'p10': p10,
+            'p25': p25,
+            'p75': p75,
+            'p90': p90
         }
     }
 
-def save_monitoring_stats(current_stats, batch_info):
+# JSONL appends are buffered per file and written in batches instead of one open/write per call
+LOG_FLUSH_EVERY = 64
+LOG_FLUSH_INTERVAL = 5.0  # seconds
+_log_buffers = {}
+_log_buffer_lock = threading.RLock()
+_log_last_flush = time.monotonic()
+
+# Recent monitoring entries per model, filled from the log once and then kept current in memory.
+# _log_tail_offset is how far into MONITORING_LOG has been parsed (None until the first read)
+RECENT_STATS_PER_MODEL = 256
+_recent_by_model = defaultdict(lambda: deque(maxlen=RECENT_STATS_PER_MODEL))
+_log_tail_offset = None
+
+def append_log_record(path, record):
+    """Queue one JSONL record for path; flushes every LOG_FLUSH_EVERY records or LOG_FLUSH_INTERVAL seconds"""
+    append_log_bytes(path, json_dumps_bytes(record) + b'\n')
+
+def append_log_bytes(path, data):
+    """Queue an already-encoded record for path, flushed together with the JSONL buffers"""
+    with _log_buffer_lock:
+        buffer = _log_buffers.setdefault(path, [])
+        buffer.append(data)
+        if len(buffer) < LOG_FLUSH_EVERY and time.monotonic() - _log_last_flush < LOG_FLUSH_INTERVAL:
+            return
+    flush_log_buffers()
+
+def flush_log_buffers():
+    """Write every buffered JSONL record to disk - one open and one write per file"""
+    global _log_last_flush
+    with _log_buffer_lock:
+        for path, lines in _log_buffers.items():
+            if lines:
+                with open(path, 'ab') as f:
+                    tracking = path == MONITORING_LOG and _log_tail_offset is not None
+                    if tracking:
+                        # Pick up lines other processes appended before ours land after them
+                        read_new_monitoring_entries(end=f.tell())
+                    f.write(b''.join(lines))
+                    if tracking:
+                        # Our own lines are already in the recent-stats deques
+                        set_log_tail_offset(f.tell())
+                lines.clear()
+        _log_last_flush = time.monotonic()
+
+def set_log_tail_offset(offset):
+    """Record how far into MONITORING_LOG the recent-stats deques reflect"""
+    global _log_tail_offset
+    _log_tail_offset = offset
+
+def read_new_monitoring_entries(end=None):
+    """Parse complete log lines past the tail offset into the per-model deques (caller holds the lock)"""
+    start = _log_tail_offset or 0
+    with open(MONITORING_LOG, 'rb') as f:
+        f.seek(start)
+        chunk = f.read() if end is None else f.read(max(0, end - start))
+    
+    # Leave a partially written last line for the next read
+    complete = chunk.rfind(b'\n') + 1
+    for line in chunk[:complete].splitlines():
+        if line.strip():
+            entry = json_loads(line)
+            _recent_by_model[entry['model_version']].append(entry)
+    set_log_tail_offset(start + complete)
+
+# Nothing buffered is lost on a normal interpreter exit
+atexit.register(flush_log_buffers)
+
+def save_monitoring_stats(current_stats, batch_info, now_iso=None):
     """Save monitoring stats for MAB tracking (no alerts)"""
     monitoring_entry = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': now_iso or datetime.now().isoformat(),
         'model_version': batch_info['model_version'],
         'batch_size': batch_info['batch_size'],
         'prediction_file': batch_info['prediction_file'],
         'stats': current_stats
     }
     
-    # Ensure monitoring directory exists
-    os.makedirs(os.path.dirname(MONITORING_LOG), exist_ok=True)
+    # Append to monitoring log (buffered); once the log has been loaded, keep the recent view current too
+    with _log_buffer_lock:
+        if _log_tail_offset is not None:
+            _recent_by_model[monitoring_entry['model_version']].append(monitoring_entry)
+        append_log_record(MONITORING_LOG, monitoring_entry)
     
-    # Append to monitoring log
-    with open(MONITORING_LOG, 'a', encoding='utf-8') as f:
-        f.write(json.dumps(monitoring_entry) + '\n')
-    
-    print(f" Monitoring stats saved for model: {batch_info['model_version']}")
+    logger.debug("Monitoring stats saved for model: %s", batch_info['model_version'])
     
     # No alerts - just return empty list
     return []
@@ -50,13 +245,13 @@ def save_monitoring_stats(current_stats, batch_info):
 def get_recent_monitoring_stats(model_version, limit=10):
     """Get recent monitoring stats for a specific model version"""
     try:
-        recent_stats = []
-        
-        with open(MONITORING_LOG, 'r', encoding='utf-8') as f:
-            for line in f:
-                entry = json.loads(line.strip())
-                if entry['model_version'] == model_version:
-                    recent_stats.append(entry)
+        with _log_buffer_lock:
+            if _log_tail_offset is None:
+                # Cold start: buffered entries must be on disk before the whole log is parsed once
+                flush_log_buffers()
+            # Afterwards only bytes appended since the last read are parsed
+            read_new_monitoring_entries()
+            recent_stats = list(_recent_by_model[model_version])
         
         # Return most recent entries
         return recent_stats[-limit:]
@@ -77,47 +272,86 @@ def generate_monitoring_report(model_version):
             print(f"No monitoring data found for model: {model_version}")
             return
         
-        print(f"\n MONITORING REPORT - Model: {model_version}")
-        print("=" * 60)
+        # Statistics trends
+        count = len(recent_stats)
+        means = np.fromiter((s['stats']['mean'] for s in recent_stats), dtype=np.float64, count=count)
+        stds = np.fromiter((s['stats']['std'] for s in recent_stats), dtype=np.float64, count=count)
         
-        # Recent batches summary
-        print(f"Recent Batches: {len(recent_stats)}")
-        print(f"Total Predictions: {sum(s['batch_size'] for s in recent_stats)}")
-        print(f"Date Range: {recent_stats[0]['timestamp'][:10]} to {recent_stats[-1]['timestamp'][:10]}")
+        # Report is assembled in memory and written out once
+        buf = io.StringIO()
+        buf.write(f"\n MONITORING REPORT - Model: {model_version}\n")
+        buf.write("=" * 60 + "\n")
         
-        # Statistics trends
-        means = [s['stats']['mean'] for s in recent_stats]
-        stds = [s['stats']['std'] for s in recent_stats]
+        # Recent batches summary
+        buf.write(f"Recent Batches: {count}\n")
+        buf.write(f"Total Predictions: {sum(s['batch_size'] for s in recent_stats)}\n")
+        buf.write(f"Date Range: {recent_stats[0]['timestamp'][:10]} to {recent_stats[-1]['timestamp'][:10]}\n")
         
-        print(f"\nProbability Trends:")
-        print(f"Mean Range: {min(means):.3f} - {max(means):.3f}")
-        print(f"Std Range: {min(stds):.3f} - {max(stds):.3f}")
+        buf.write("\nProbability Trends:\n")
+        buf.write(f"Mean Range: {means.min():.3f} - {means.max():.3f}\n")
+        buf.write(f"Std Range: {stds.min():.3f} - {stds.max():.3f}\n")
         
-        print("=" * 60)
+        buf.write("=" * 60 + "\n")
+        sys.stdout.write(buf.getvalue())
         
     except Exception as e:
         print(f"Error generating monitoring report: {e}")
 
-def monitor_predictions(probabilities, batch_info):
+# Stats computed per monitored batch: 'none' (bandit counters only), 'basic' (mean/std/count)
+# or 'full' (adds median and percentiles). The MAB prediction path uses MONITOR_STATS_LEVEL
+STATS_LEVELS = ('none', 'basic', 'full')
+MONITOR_STATS_LEVEL = os.getenv('CATCHLEAD_MONITOR_STATS_LEVEL', 'basic')
+if MONITOR_STATS_LEVEL not in STATS_LEVELS:
+    logger.warning("Unknown CATCHLEAD_MONITOR_STATS_LEVEL %r, using 'basic'", MONITOR_STATS_LEVEL)
+    MONITOR_STATS_LEVEL = 'basic'
+
+# Opt-in shadow scoring: while the bandit is exploring (several models get traffic), the other
+# active models also score each batch so their output can be compared with the served one
+SHADOW_SCORING = os.getenv('CATCHLEAD_SHADOW_SCORING', '0') == '1'
+
+# Model memory management and auto-retirement run every HOUSEKEEP_EVERY batches, or after
+# HOUSEKEEP_INTERVAL seconds so a quiet service still gets cleaned up
+HOUSEKEEP_EVERY = 500
+HOUSEKEEP_INTERVAL = 60.0  # seconds
+_housekeeping_counter = itertools.count()
+_last_housekeep = 0.0
+
+def maybe_run_housekeeping():
+    """Run manage_model_memory when the batch counter or the interval says it is due"""
+    global _last_housekeep
+    now = time.monotonic()
+    if next(_housekeeping_counter) % HOUSEKEEP_EVERY == 0 or now - _last_housekeep > HOUSEKEEP_INTERVAL:
+        _last_housekeep = now
+        manage_model_memory()
+        mab_predictor.last_memory_check = time.time()
+
+def monitor_predictions(probabilities, batch_info, now_iso=None, stats_level='full'):
     """MAB-focused monitoring function (no drift alerts)"""
+    if stats_level not in STATS_LEVELS:
+        raise ValueError(f"stats_level must be one of {STATS_LEVELS}, got {stats_level!r}")
+    # One timestamp for every record this batch produces
+    now_iso = now_iso or batch_info.get('timestamp') or datetime.now().isoformat()
     try:
-        # Calculate basic stats for tracking
-        current_stats = baseLine_stats(probabilities)
-        
-        # Save stats for MAB tracking (no alerts)
-        save_monitoring_stats(current_stats, batch_info)
+        current_stats = None
+        if stats_level != 'none':
+            # Calculate basic stats for tracking
+            current_stats = baseLine_stats(probabilities, level=stats_level)
+            
+            # Save stats for MAB tracking (no alerts)
+            save_monitoring_stats(current_stats, batch_info, now_iso=now_iso)
         
         # Track model performance for MAB
         model_performance = track_model_performance(
             batch_info['model_version'], 
-            batch_info['batch_size']
+            batch_info['batch_size'],
+            now_iso=now_iso
         )
         
-        # Get current traffic allocation
-        traffic_allocation = get_traffic_allocation()
+        # Get current traffic allocation (shared with model selection, recomputed at most every TTL)
+        traffic_allocation = get_cached_allocation()['allocation']
         
-        # Check memory usage and optimize if needed
-        manage_model_memory()
+        # Check memory usage and retire old models - amortized over batches
+        maybe_run_housekeeping()
         
         # Return MAB-focused results
         return {
@@ -135,23 +369,49 @@ def monitor_predictions(probabilities, batch_info):
         }
         
     except Exception as e:
-        print(f"Error in MAB monitoring: {e}")
+        logger.error("Error in MAB monitoring: %s", e)
         return None
 
 # OPTIMIZED MULTI-ARMED BANDIT IMPLEMENTATION
 
+def expected_input_dtype(model):
+    """Float dtype the fitted estimator computes in (its coefficients), float64 if unknown"""
+    estimator = getattr(model, 'best_estimator_', model)
+    coef = getattr(estimator, 'coef_', None)
+    if coef is not None and np.issubdtype(coef.dtype, np.floating):
+        return coef.dtype
+    return np.dtype(np.float64)
+
+def as_model_input(batch_data, dtype):
+    """Convert a batch to the model's dtype and C layout once, so predict_proba does not copy again"""
+    if isinstance(batch_data, pd.DataFrame):
+        # Keep the frame (sklearn checks feature names) and only cast columns that differ
+        if (batch_data.dtypes != dtype).any():
+            batch_data = batch_data.astype(dtype)
+        return batch_data
+    batch_data = np.asarray(batch_data)
+    if batch_data.dtype != dtype or not batch_data.flags['C_CONTIGUOUS']:
+        batch_data = np.ascontiguousarray(batch_data, dtype=dtype)
+    return batch_data
+
+# Loaded models are bounded by the size of their .pkl files; idle ones are swept after the TTL
+MODEL_CACHE_BUDGET_BYTES = int(os.getenv('CATCHLEAD_MODEL_CACHE_MB', '4096')) * 1024 * 1024
+MODEL_IDLE_SECONDS = int(os.getenv('CATCHLEAD_MODEL_IDLE_SECONDS', '1800'))
+
 class OptimizedMABPredictor:
     """Optimized Multi-Armed Bandit with pre-loaded models and smart memory management"""
     
-    def __init__(self):
-        self.models = {}
+    def __init__(self, budget_bytes=MODEL_CACHE_BUDGET_BYTES):
+        # LRU order: least recently used first, most recently used last
+        self.models = OrderedDict()
+        self.model_bytes = {}
+        self.model_dtype = {}
+        self.cached_bytes = 0
+        self.budget_bytes = budget_bytes
         self.model_metadata = {}
-        self.performance_file = os.path.join(os.path.dirname(__file__), '..', '..', 'metadata', 'model_performance.json')
+        self.performance_file = PERFORMANCE_FILE
         self.last_memory_check = time.time()
         
-        # Initialize directories
-        os.makedirs(os.path.dirname(self.performance_file), exist_ok=True)
-        
         print(" Optimized MAB Predictor initialized")
     
     def load_model_if_needed(self, model_version):
@@ -161,34 +421,68 @@ class OptimizedMABPredictor:
                 import joblib
                 
                 # Construct model path
-                model_path = os.path.join(os.path.dirname(__file__), '..', '..', 'models', f'{model_version}.pkl')
+                model_path = os.path.join(MODELS_DIR, f'{model_version}.pkl')
                 
                 if os.path.exists(model_path):
-                    print(f" Loading model: {model_version}")
+                    logger.info("Loading model: %s", model_version)
                     start_time = time.time()
                     
-                    self.models[model_version] = joblib.load(model_path)
+                    # Memory-map the numpy arrays (read-only, fine for inference) so load time is just the
+                    # Python wrappers and workers share pages. train_model dumps uncompressed, which mmap needs;
+                    # joblib ignores mmap_mode for compressed pickles and loads them fully
+                    self.models[model_version] = joblib.load(model_path, mmap_mode='r')
                     load_time = time.time() - start_time
                     
+                    self.model_dtype[model_version] = expected_input_dtype(self.models[model_version])
+                    self.model_bytes[model_version] = os.path.getsize(model_path)
+                    self.cached_bytes += self.model_bytes[model_version]
                     self.model_metadata[model_version] = {
                         'load_time': load_time,
                         'last_used': time.time(),
                         'prediction_count': 0
                     }
                     
-                    print(f" Loaded {model_version} in {load_time:.2f}s")
+                    logger.info("Loaded %s in %.2fs", model_version, load_time)
+                    self.evict_over_budget()
                     return True
                 else:
-                    print(f" Model file not found: {model_path}")
+                    logger.warning("Model file not found: %s", model_path)
                     return False
             except Exception as e:
-                print(f" Failed to load {model_version}: {e}")
+                logger.error("Failed to load %s: %s", model_version, e)
                 return False
         else:
-            # Update last used time
+            # Update last used time and LRU position
+            self.models.move_to_end(model_version)
             self.model_metadata[model_version]['last_used'] = time.time()
             return True
     
+    def unload_model(self, model_version):
+        """Drop a loaded model and its bookkeeping"""
+        del self.models[model_version]
+        del self.model_metadata[model_version]
+        self.model_dtype.pop(model_version, None)
+        self.cached_bytes -= self.model_bytes.pop(model_version, 0)
+    
+    def evict_over_budget(self):
+        """Unload least recently used models until the cache fits the byte budget"""
+        # The most recent model always stays, even if it alone is over budget
+        while self.cached_bytes > self.budget_bytes and len(self.models) > 1:
+            model_version = next(iter(self.models))
+            logger.info("Evicting least recently used model: %s", model_version)
+            self.unload_model(model_version)
+    
+    def evict_idle(self, max_idle_seconds=MODEL_IDLE_SECONDS):
+        """Unload models that have not been used for max_idle_seconds"""
+        cutoff = time.time() - max_idle_seconds
+        # Models are in LRU order, so stop at the first one used after the cutoff
+        while self.models:
+            model_version = next(iter(self.models))
+            if self.model_metadata[model_version]['last_used'] >= cutoff:
+                break
+            logger.info("Unloading idle model: %s", model_version)
+            self.unload_model(model_version)
+    
     def predict_batch_optimized(self, batch_data, model_version):
         """Optimized prediction for a specific model"""
         
@@ -201,40 +495,71 @@ class OptimizedMABPredictor:
         try:
             # Get model and predict
             model = self.models[model_version]
+            batch_data = as_model_input(batch_data, self.model_dtype[model_version])
             predictions = model.predict_proba(batch_data)[:, 1]
             
             # Update metadata
             prediction_time = time.time() - start_time
             self.model_metadata[model_version]['prediction_count'] += len(predictions)
             
-            print(f" {model_version}: {len(predictions)} predictions in {prediction_time*1000:.1f}ms")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s: %d predictions in %.1fms", model_version, len(predictions), prediction_time * 1000)
             
             return predictions, prediction_time
             
         except Exception as e:
-            print(f" Prediction failed for {model_version}: {e}")
+            logger.error("Prediction failed for %s: %s", model_version, e)
             return None, 0
     
-    def unload_unused_models(self, keep_recent=3):
-        """Unload models that haven't been used recently"""
-        if len(self.models) <= keep_recent:
-            return
+    def predict_batch_multi(self, batch_data, model_versions):
+        """Score one batch with several models at once (shadow scoring during exploration)"""
+        from joblib import Parallel, delayed
         
-        # Sort by last used time
-        models_by_usage = sorted(
-            self.model_metadata.items(),
-            key=lambda x: x[1]['last_used'],
-            reverse=True
-        )
+        # Hold each model as it loads - loading a later one can LRU-evict an earlier one from self.models
+        loaded = {}
+        for model_version in model_versions:
+            if self.load_model_if_needed(model_version):
+                loaded[model_version] = (self.models[model_version], self.model_dtype[model_version])
+        if not loaded:
+            return {}
+        
+        def score(model_version):
+            model, dtype = loaded[model_version]
+            try:
+                return model.predict_proba(as_model_input(batch_data, dtype))[:, 1]
+            except Exception as e:
+                # One failing model must not drop the others' scores
+                logger.error("Prediction failed for %s: %s", model_version, e)
+                return None
+        
+        start_time = time.time()
         
-        # Keep only recent models
-        models_to_keep = [item[0] for item in models_by_usage[:keep_recent]]
-        models_to_remove = [model for model in self.models.keys() if model not in models_to_keep]
+        # Threads, not processes: sklearn releases the GIL in its numeric kernels and the batch is not pickled
+        n_jobs = min(len(loaded), os.cpu_count() or 1)
+        results = Parallel(n_jobs=n_jobs, backend='threading')(delayed(score)(v) for v in loaded)
         
-        for model_version in models_to_remove:
+        scores = {}
+        for model_version, predictions in zip(loaded, results):
+            if predictions is None:
+                continue
+            scores[model_version] = predictions
+            metadata = self.model_metadata.get(model_version)
+            if metadata is not None:
+                metadata['prediction_count'] += len(predictions)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%d of %d models scored the batch in %.1fms", len(scores), len(loaded),
+                         (time.time() - start_time) * 1000)
+        
+        return scores
+    
+    def unload_unused_models(self, keep_recent=3):
+        """Unload models that haven't been used recently"""
+        # self.models is kept in LRU order, so the oldest entries come first
+        while len(self.models) > keep_recent:
+            model_version = next(iter(self.models))
             print(f" Unloading unused model: {model_version}")
-            del self.models[model_version]
-            del self.model_metadata[model_version]
+            self.unload_model(model_version)
     
     def get_memory_usage(self):
         """Get current memory usage (optional - works without psutil)"""
@@ -251,10 +576,67 @@ class OptimizedMABPredictor:
 # Global optimized MAB predictor
 mab_predictor = OptimizedMABPredictor()
 
+# model_performance.json is loaded once and served from memory. Updates mark it dirty and are
+# written back in batches; while nothing is pending, an mtime change (another process wrote
+# the file) triggers a reload
+PERF_FLUSH_EVERY = 50  # updates
+PERF_FLUSH_INTERVAL = 5.0  # seconds
+_perf_cache = None
+_perf_mtime = None
+_perf_pending = 0
+_perf_last_flush = time.monotonic()
+_perf_lock = threading.RLock()
+# Bumped on every in-memory change or reload so derived views know when to rebuild
+_perf_version = 0
+_active_cache = {'version': None, 'models': []}
+
+def load_performance_data():
+    """model_version -> performance record (shared dict - mutate only under _perf_lock)"""
+    global _perf_cache, _perf_mtime, _perf_version
+    with _perf_lock:
+        if _perf_pending:
+            return _perf_cache
+        try:
+            mtime = os.stat(PERFORMANCE_FILE).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if _perf_cache is None or mtime != _perf_mtime:
+            if mtime is None:
+                _perf_cache = {}
+            else:
+                with open(PERFORMANCE_FILE, 'rb') as f:
+                    _perf_cache = json_loads(f.read())
+            _perf_mtime = mtime
+            _perf_version += 1
+        return _perf_cache
+
+def mark_performance_dirty(force_flush=False):
+    """Record an in-memory update; write back every PERF_FLUSH_EVERY updates or PERF_FLUSH_INTERVAL seconds"""
+    global _perf_pending, _perf_version
+    with _perf_lock:
+        _perf_pending += 1
+        _perf_version += 1
+        if (force_flush or _perf_pending >= PERF_FLUSH_EVERY
+                or time.monotonic() - _perf_last_flush >= PERF_FLUSH_INTERVAL):
+            flush_performance_data()
+
+def flush_performance_data():
+    """Atomically write pending performance updates to disk"""
+    global _perf_pending, _perf_mtime, _perf_last_flush
+    with _perf_lock:
+        if not _perf_pending:
+            return
+        write_json_atomic(PERFORMANCE_FILE, _perf_cache, indent=True)
+        _perf_mtime = os.stat(PERFORMANCE_FILE).st_mtime_ns
+        _perf_pending = 0
+        _perf_last_flush = time.monotonic()
+
+atexit.register(flush_performance_data)
+
 def get_latest_model_from_config():
     """Get the latest model from models_version.json"""
     try:
-        models_version_file = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'models_version.json')
+        models_version_file = MODELS_VERSION_FILE
         with open(models_version_file, 'r') as f:
             config = json.load(f)
         
@@ -262,53 +644,67 @@ def get_latest_model_from_config():
             latest_timestamp = config['timestamps'][-1]  # Get the most recent timestamp
             return f"model_V{latest_timestamp}"
         else:
-            print(" No timestamps found in models_version.json")
+            logger.warning("No timestamps found in models_version.json")
             return None
     except FileNotFoundError:
-        print(" models_version.json not found")
+        logger.warning("models_version.json not found")
         return None
     except Exception as e:
-        print(f" Error reading models_version.json: {e}")
+        logger.error("Error reading models_version.json: %s", e)
         return None
 
-def track_model_performance(model_version, num_predictions):
+def track_model_performance(model_version, num_predictions, now_iso=None):
     """Enhanced model performance tracking with memory optimization"""
     
-    performance_file = os.path.join(os.path.dirname(__file__), '..', '..', 'metadata', 'model_performance.json')
-    os.makedirs(os.path.dirname(performance_file), exist_ok=True)
+    with _perf_lock:
+        # Load existing performance data (in memory after the first call)
+        performance_data = load_performance_data()
+        
+        # Initialize model if not exists
+        if model_version not in performance_data:
+            performance_data[model_version] = {
+                'total_predictions': 0,
+                'total_conversions': 0,
+                'conversion_rate': 0.0,
+                'first_seen': now_iso or datetime.now().isoformat(),
+                'last_updated_ts': time.time(),
+                'status': 'active',
+                'confidence_interval': {'lower': 0, 'upper': 0}
+            }
+        
+        # Update predictions count
+        performance_data[model_version]['total_predictions'] += num_predictions
+        touch_last_updated(performance_data[model_version])
+        
+        # Calculate confidence interval
+        performance_data[model_version]['confidence_interval'] = calculate_confidence_interval(performance_data[model_version])
+        model_performance = dict(performance_data[model_version])
+        
+        # Written back in batches
+        mark_performance_dirty()
     
-    # Load existing performance data
+    logger.debug("Tracked %d predictions for %s", num_predictions, model_version)
+    return model_performance
+
+def touch_last_updated(model_data):
+    """Stamp a performance record with the current epoch time"""
+    model_data['last_updated_ts'] = time.time()
+    # Drop the ISO string older files carried so the two never disagree
+    model_data.pop('last_updated', None)
+
+def last_updated_ts(model_data):
+    """Epoch seconds of a record's last update, falling back to the old ISO 'last_updated' string"""
+    ts = model_data.get('last_updated_ts')
+    if ts is not None:
+        return ts
     try:
-        with open(performance_file, 'r') as f:
-            performance_data = json.load(f)
-    except FileNotFoundError:
-        performance_data = {}
-    
-    # Initialize model if not exists
-    if model_version not in performance_data:
-        performance_data[model_version] = {
-            'total_predictions': 0,
-            'total_conversions': 0,
-            'conversion_rate': 0.0,
-            'first_seen': datetime.now().isoformat(),
-            'last_updated': datetime.now().isoformat(),
-            'status': 'active',
-            'confidence_interval': {'lower': 0, 'upper': 0}
-        }
-    
-    # Update predictions count
-    performance_data[model_version]['total_predictions'] += num_predictions
-    performance_data[model_version]['last_updated'] = datetime.now().isoformat()
-    
-    # Calculate confidence interval
-    performance_data[model_version]['confidence_interval'] = calculate_confidence_interval(performance_data[model_version])
-    
-    # Save back to file
-    with open(performance_file, 'w') as f:
-        json.dump(performance_data, f, indent=2)
-    
-    print(f" Tracked {num_predictions} predictions for {model_version}")
-    return performance_data[model_version]
+        return datetime.fromisoformat(model_data['last_updated']).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return 0.0
+
+def format_timestamp(ts):
+    """ISO string for an epoch timestamp - only built when a record is displayed"""
+    return datetime.fromtimestamp(ts).isoformat()
 
 def calculate_confidence_interval(model_data, confidence_level=0.95):
     """Calculate confidence interval for conversion rate"""
@@ -335,46 +731,53 @@ def calculate_confidence_interval(model_data, confidence_level=0.95):
 def get_active_models():
     """Get list of active models with sufficient data"""
     
-    performance_file = os.path.join(os.path.dirname(__file__), '..', '..', 'metadata', 'model_performance.json')
-    
-    try:
-        with open(performance_file, 'r') as f:
-            performance_data = json.load(f)
-    except FileNotFoundError:
+    with _perf_lock:
+        performance_data = load_performance_data()
+        # Rebuilt only when the performance data changed since the last call
+        if _active_cache['version'] != _perf_version:
+            _active_cache['models'] = collect_active_models(performance_data)
+            _active_cache['version'] = _perf_version
+        return list(_active_cache['models'])
+
+def collect_active_models(performance_data):
+    """Active models from the performance records, best conversion rate first"""
+    if not performance_data:
         return []
     
-    # Filter active models - reduced minimum for real usage
-    active_models = []
     min_predictions = 10  # Reduced minimum for actual usage
     
-    for model_version, data in performance_data.items():
-        if (data.get('status', 'active') == 'active' and 
-            data['total_predictions'] >= min_predictions):
-            active_models.append({
-                'model_version': model_version,
-                'conversion_rate': data['conversion_rate'],
-                'total_predictions': data['total_predictions'],
-                'total_conversions': data['total_conversions'],
-                'confidence_interval': data.get('confidence_interval', {'lower': 0, 'upper': 0}),
-                'last_updated': data['last_updated']
-            })
+    # One column per field so filtering and ordering run over arrays instead of per-record dicts
+    names = list(performance_data.keys())
+    records = list(performance_data.values())
+    active = np.fromiter((data.get('status', 'active') == 'active' for data in records), dtype=bool, count=len(records))
+    predictions = np.fromiter((data['total_predictions'] for data in records), dtype=np.int64, count=len(records))
+    rates = np.fromiter((data['conversion_rate'] for data in records), dtype=np.float64, count=len(records))
+    
+    # Filter active models - reduced minimum for real usage
+    selected = np.flatnonzero(active & (predictions >= min_predictions))
     
     # If no models meet minimum, include all active models with any data
-    if not active_models:
-        for model_version, data in performance_data.items():
-            if data.get('status', 'active') == 'active':
-                active_models.append({
-                    'model_version': model_version,
-                    'conversion_rate': data['conversion_rate'],
-                    'total_predictions': data['total_predictions'],
-                    'total_conversions': data['total_conversions'],
-                    'confidence_interval': data.get('confidence_interval', {'lower': 0, 'upper': 0}),
-                    'last_updated': data['last_updated']
-                })
-                print(f"📊 Including model {model_version} with {data['total_predictions']} predictions")
-    
-    # Sort by conversion rate (descending)
-    active_models.sort(key=lambda x: x['conversion_rate'], reverse=True)
+    fallback = selected.size == 0
+    if fallback:
+        selected = np.flatnonzero(active)
+    
+    # Sort by conversion rate (descending); stable so ties keep file order as before
+    selected = selected[np.argsort(-rates[selected], kind='stable')]
+    
+    active_models = []
+    for i in selected.tolist():
+        data = records[i]
+        active_models.append({
+            'model_version': names[i],
+            'conversion_rate': data['conversion_rate'],
+            'total_predictions': data['total_predictions'],
+            'total_conversions': data['total_conversions'],
+            'confidence_interval': data.get('confidence_interval', {'lower': 0, 'upper': 0}),
+            'last_updated': format_timestamp(last_updated_ts(data))
+        })
+        if fallback:
+            logger.debug("Including model %s with %d predictions", names[i], data['total_predictions'])
+    
     return active_models
 
 def get_traffic_allocation():
@@ -394,20 +797,22 @@ def get_traffic_allocation():
             'algorithm': 'single_model'
         }
     
-    print(f" Evaluating {len(active_models)} active models:")
-    for model in active_models:
-        ci = model['confidence_interval']
-        print(f"   {model['model_version']}: {model['conversion_rate']:.1f}% "
-              f"({model['total_conversions']}/{model['total_predictions']}) "
-              f"CI: [{ci['lower']:.1f}%, {ci['upper']:.1f}%]")
-    
     # Use Thompson Sampling for optimal allocation
     allocation = thompson_sampling_allocation(active_models)
     
-    print(f" Traffic Allocation (Thompson Sampling):")
-    for model_version, weight in allocation.items():
-        if model_version not in ['reason', 'winner', 'algorithm', 'total_models']:
-            print(f"   {model_version}: {weight:.1%}")
+    # Per-model breakdown is only formatted when debug logging is on
+    if logger.isEnabledFor(logging.DEBUG):
+        lines = [f"Evaluating {len(active_models)} active models:"]
+        for model in active_models:
+            ci = model['confidence_interval']
+            lines.append(f"   {model['model_version']}: {model['conversion_rate']:.1f}% "
+                         f"({model['total_conversions']}/{model['total_predictions']}) "
+                         f"CI: [{ci['lower']:.1f}%, {ci['upper']:.1f}%]")
+        lines.append("Traffic Allocation (Thompson Sampling):")
+        for model_version, weight in allocation.items():
+            if model_version not in ['reason', 'winner', 'algorithm', 'total_models']:
+                lines.append(f"   {model_version}: {weight:.1%}")
+        logger.debug("\n".join(lines))
     
     return allocation
 
@@ -416,33 +821,21 @@ def thompson_sampling_allocation(active_models):
     
     # Number of samples for Thompson Sampling
     num_samples = 5000  # Reduced for better performance
-    model_wins = {model['model_version']: 0 for model in active_models}
+    model_versions = [model['model_version'] for model in active_models]
     
-    for _ in range(num_samples):
-        sampled_rates = {}
-        
-        for model in active_models:
-            # Beta distribution parameters
-            successes = model['total_conversions']
-            failures = model['total_predictions'] - model['total_conversions']
-            
-            # Add prior to avoid issues with zero data
-            alpha = successes + 1
-            beta = failures + 1
-            
-            # Sample from Beta distribution
-            sampled_rate = random.betavariate(alpha, beta)
-            sampled_rates[model['model_version']] = sampled_rate
-        
-        # Find winner for this sample
-        winner = max(sampled_rates, key=sampled_rates.get)
-        model_wins[winner] += 1
+    # Beta distribution parameters, with a uniform prior to avoid issues with zero data
+    successes = np.array([model['total_conversions'] for model in active_models], dtype=np.float64)
+    trials = np.array([model['total_predictions'] for model in active_models], dtype=np.float64)
+    alpha = successes + 1
+    beta = trials - successes + 1
+    
+    model_wins = thompson_wins(alpha, beta, num_samples)
     
     # Convert wins to allocation percentages
     allocation = {}
-    best_model = max(model_wins, key=model_wins.get)
+    best_model = model_versions[int(model_wins.argmax())]
     
-    for model_version, wins in model_wins.items():
+    for model_version, wins in zip(model_versions, model_wins.tolist()):
         allocation[model_version] = wins / num_samples
     
     # Add metadata
@@ -453,21 +846,45 @@ def thompson_sampling_allocation(active_models):
     
     return allocation
 
+# Traffic allocation reused across predictions for a short window instead of re-sampling per call
+ALLOCATION_TTL_SECONDS = 10
+_allocation_cache = {'ts': 0.0, 'allocation': None, 'weights': None, 'names': None, 'cum': None}
+
+def invalidate_allocation_cache():
+    """Force the next model selection to recompute the traffic allocation"""
+    _allocation_cache['ts'] = 0.0
+
+def get_cached_allocation():
+    """Traffic allocation plus its model names and cumulative weights, recomputed at most every TTL"""
+    now = time.monotonic()
+    if _allocation_cache['allocation'] is None or now - _allocation_cache['ts'] >= ALLOCATION_TTL_SECONDS:
+        allocation = get_traffic_allocation()
+        model_weights = {k: v for k, v in allocation.items()
+                        if k not in ['reason', 'winner', 'algorithm', 'total_models']}
+        _allocation_cache.update(
+            ts=now,
+            allocation=allocation,
+            weights=model_weights,
+            names=list(model_weights.keys()),
+            cum=np.cumsum(np.fromiter(model_weights.values(), dtype=np.float64, count=len(model_weights)))
+        )
+    return _allocation_cache
+
 def choose_model_for_prediction():
     """Optimized model selection with smart fallback to real models"""
     
-    allocation = get_traffic_allocation()
-    model_weights = {k: v for k, v in allocation.items() 
-                    if k not in ['reason', 'winner', 'algorithm', 'total_models']}
+    cached = get_cached_allocation()
+    allocation = cached['allocation']
+    model_weights = cached['weights']
     
     # If no active models in MAB system, fallback to latest model from config
     if not model_weights:
         latest_model = get_latest_model_from_config()
         if latest_model:
-            print(f" No active MAB models, using latest model from config: {latest_model}")
+            logger.debug("No active MAB models, using latest model from config: %s", latest_model)
             return latest_model
         else:
-            print(" No models available - neither in MAB system nor in config")
+            logger.warning("No models available - neither in MAB system nor in config")
             return None
     
     if len(model_weights) == 1:
@@ -477,41 +894,39 @@ def choose_model_for_prediction():
         if selected_model == "default_model":
             latest_model = get_latest_model_from_config()
             if latest_model:
-                print(f" Replacing default_model with latest actual model: {latest_model}")
+                logger.debug("Replacing default_model with latest actual model: %s", latest_model)
                 return latest_model
             else:
-                print(" default_model detected but no actual models found")
+                logger.warning("default_model detected but no actual models found")
                 return None
         else:
-            print(f" Only one active model: {selected_model}")
+            logger.debug("Only one active model: %s", selected_model)
             return selected_model
     
-    # Optimized weighted random selection
-    rand_val = random.random()
-    cumulative = 0.0
+    # Weighted random selection - first model whose cumulative weight reaches rand_val
+    rand_val = next_uniform()
     
-    print(f" Random value: {rand_val:.3f}")
-    print(f" Active models: {len(model_weights)}")
-    
-    for model, weight in model_weights.items():
-        cumulative += weight
-        if rand_val <= cumulative:
-            print(f" Selected: {model} (weight: {weight:.1%})")
-            return model
+    index = int(np.searchsorted(cached['cum'], rand_val))
+    if index < len(cached['names']):
+        model = cached['names'][index]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Random value %.3f over %d active models - selected %s (weight: %.1f%%)",
+                         rand_val, len(model_weights), model, model_weights[model] * 100)
+        return model
     
     # Fallback to winner
     winner = allocation.get('winner')
     if winner and winner in model_weights and winner != "default_model":
-        print(f" Fallback to winner: {winner}")
+        logger.debug("Fallback to winner: %s", winner)
         return winner
     
     # Final fallback to latest model from config
     latest_model = get_latest_model_from_config()
     if latest_model:
-        print(f" Final fallback to latest model from config: {latest_model}")
+        logger.debug("Final fallback to latest model from config: %s", latest_model)
         return latest_model
     
-    print(" No valid models found")
+    logger.warning("No valid models found")
     return None
 
 def predict_with_mab_optimized(batch_data):
@@ -519,32 +934,34 @@ def predict_with_mab_optimized(batch_data):
     global mab_predictor
     
     start_time = time.time()
+    # Formatted once and shared by batch_info and every monitoring record for this batch
+    now_iso = datetime.now().isoformat()
     
     # Choose optimal model
     selected_model = choose_model_for_prediction()
     
     if selected_model is None:
-        print(" No valid model selected, cannot proceed with prediction")
+        logger.warning("No valid model selected, cannot proceed with prediction")
         return None, None, None
     
-    print(f" Selected model for prediction: {selected_model}")
+    logger.debug("Selected model for prediction: %s", selected_model)
     
     # Predict with selected model
     result = mab_predictor.predict_batch_optimized(batch_data, selected_model)
     
     if result is None:
-        print(f" Prediction failed with {selected_model}")
+        logger.error("Prediction failed with %s", selected_model)
         return None, None, None
     
     # Unpack the result safely
     if isinstance(result, tuple) and len(result) == 2:
         predictions, prediction_time = result
     else:
-        print(f" Unexpected prediction result format: {result}")
+        logger.error("Unexpected prediction result format: %r", result)
         return None, None, None
     
     if predictions is None:
-        print(f" Prediction returned None for {selected_model}")
+        logger.error("Prediction returned None for %s", selected_model)
         return None, None, None
     
     total_time = time.time() - start_time
@@ -554,86 +971,171 @@ def predict_with_mab_optimized(batch_data):
         'model_version': selected_model,
         'batch_size': len(predictions),
         'prediction_file': f'mab_{selected_model}_predictions.csv',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': now_iso,
         'prediction_time_ms': prediction_time * 1000,
         'total_time_ms': total_time * 1000,
         'mab_type': 'optimized_thompson_sampling'
     }
     
-    # Monitor with enhanced tracking
-    monitoring_result = monitor_predictions(predictions, batch_info)
+    # Monitor with enhanced tracking (also runs memory housekeeping when it is due)
+    monitoring_result = monitor_predictions(predictions, batch_info, now_iso=now_iso, stats_level=MONITOR_STATS_LEVEL)
     
-    # Check memory usage periodically
-    if time.time() - mab_predictor.last_memory_check > 300:  # Every 5 minutes
-        manage_model_memory()
-        mab_predictor.last_memory_check = time.time()
+    if SHADOW_SCORING and monitoring_result is not None:
+        monitoring_result['shadow_scores'] = shadow_score_batch(batch_data, selected_model)
     
     return predictions, selected_model, monitoring_result
 
+def shadow_score_batch(batch_data, selected_model):
+    """Mean score of every other model the bandit is exploring, for comparison with the served model"""
+    candidates = [v for v in get_cached_allocation()['names'] if v != selected_model]
+    if not candidates:
+        return {}
+    scores = mab_predictor.predict_batch_multi(batch_data, candidates)
+    return {model_version: float(predictions.mean()) for model_version, predictions in scores.items()}
+
 def update_conversions(lead_id, model_version):
     """Enhanced conversion tracking with automatic reallocation"""
     
-    performance_file = os.path.join(os.path.dirname(__file__), '..', '..', 'metadata', 'model_performance.json')
-    
-    try:
-        with open(performance_file, 'r') as f:
-            performance_data = json.load(f)
-    except FileNotFoundError:
-        print(" No performance data found")
-        return
-    
-    if model_version in performance_data:
+    with _perf_lock:
+        performance_data = load_performance_data()
+        if not performance_data:
+            print(" No performance data found")
+            return
+        
+        if model_version not in performance_data:
+            print(f" Model version {model_version} not found")
+            return
+        
         performance_data[model_version]['total_conversions'] += 1
         
         # Recalculate conversion rate
         total_pred = performance_data[model_version]['total_predictions']
         total_conv = performance_data[model_version]['total_conversions']
         performance_data[model_version]['conversion_rate'] = (total_conv / total_pred) * 100
-        performance_data[model_version]['last_updated'] = datetime.now().isoformat()
+        touch_last_updated(performance_data[model_version])
         
         # Update confidence interval
         performance_data[model_version]['confidence_interval'] = calculate_confidence_interval(performance_data[model_version])
+        model_performance = dict(performance_data[model_version])
         
-        # Save updated data
-        with open(performance_file, 'w') as f:
-            json.dump(performance_data, f, indent=2)
-        
-        print(f" Conversion tracked for {model_version}: {total_conv}/{total_pred} = {performance_data[model_version]['conversion_rate']:.1f}%")
-        
-        # Recalculate optimal allocation
-        new_allocation = get_traffic_allocation()
-        print(f" Updated allocation for {new_allocation.get('total_models', 0)} models")
-        
-        # Log conversion for tracking
-        log_conversion_event(lead_id, model_version, performance_data[model_version])
-        
-    else:
-        print(f" Model version {model_version} not found")
+        # Conversions are rare and move the allocation - write them through right away
+        mark_performance_dirty(force_flush=True)
+        invalidate_allocation_cache()
+    
+    print(f" Conversion tracked for {model_version}: {total_conv}/{total_pred} = {model_performance['conversion_rate']:.1f}%")
+    
+    # Recalculate optimal allocation
+    new_allocation = get_traffic_allocation()
+    print(f" Updated allocation for {new_allocation.get('total_models', 0)} models")
+    
+    # Log conversion for tracking
+    log_conversion_event(lead_id, model_version, model_performance)
+
+# Conversion events are fixed-size little-endian records: timestamp, lead id, model hash,
+# conversion rate, CI lower/upper, total predictions, total conversions (60 bytes each).
+# Rates stay float64 so they round-trip exactly like the JSONL record did.
+# The model hash is a CRC32 of the version name; CONVERSION_MODELS_FILE maps it back
+CONVERSION_RECORD = struct.Struct('<dQIdddQQ')
+_conversion_models = None
+_conversion_models_lock = threading.Lock()
+
+def conversion_model_hash(model_version):
+    """Stable 32-bit id for a model version, registered in the sidecar map on first use"""
+    global _conversion_models
+    model_id = zlib.crc32(model_version.encode('utf-8'))
+    with _conversion_models_lock:
+        if _conversion_models is None:
+            _conversion_models = load_conversion_models()
+        if _conversion_models.get(str(model_id)) != model_version:
+            _conversion_models[str(model_id)] = model_version
+            write_json_atomic(CONVERSION_MODELS_FILE, _conversion_models, indent=True)
+    return model_id
+
+def load_conversion_models():
+    """Model hash (as str) -> model version from the sidecar map"""
+    try:
+        with open(CONVERSION_MODELS_FILE, 'rb') as f:
+            return json_loads(f.read())
+    except FileNotFoundError:
+        return {}
 
 def log_conversion_event(lead_id, model_version, model_performance):
     """Log conversion events for tracking"""
     
-    conversion_log = os.path.join(os.path.dirname(__file__), '..', '..', 'metadata', 'conversions.jsonl')
-    os.makedirs(os.path.dirname(conversion_log), exist_ok=True)
-    
-    conversion_record = {
-        'timestamp': datetime.now().isoformat(),
-        'lead_id': lead_id,
-        'model_version': model_version,
-        'conversion_rate_after': model_performance['conversion_rate'],
-        'total_predictions': model_performance['total_predictions'],
-        'total_conversions': model_performance['total_conversions'],
-        'confidence_interval': model_performance['confidence_interval']
-    }
+    ci = model_performance['confidence_interval']
+    try:
+        record = CONVERSION_RECORD.pack(
+            time.time(),
+            int(lead_id),
+            conversion_model_hash(model_version),
+            model_performance['conversion_rate'],
+            ci['lower'],
+            ci['upper'],
+            model_performance['total_predictions'],
+            model_performance['total_conversions']
+        )
+    except (TypeError, ValueError, OverflowError, struct.error):
+        # Lead ids that are not unsigned 64-bit integers keep the JSONL format
+        conversion_record = {
+            'timestamp': datetime.now().isoformat(),
+            'lead_id': lead_id,
+            'model_version': model_version,
+            'conversion_rate_after': model_performance['conversion_rate'],
+            'total_predictions': model_performance['total_predictions'],
+            'total_conversions': model_performance['total_conversions'],
+            'confidence_interval': ci
+        }
+        append_log_record(CONVERSION_LOG, conversion_record)
+        return
     
-    with open(conversion_log, 'a') as f:
-        f.write(json.dumps(conversion_record) + '\n')
+    append_log_bytes(CONVERSION_BIN_LOG, record)
+
+def read_conversion_log(path=CONVERSION_BIN_LOG, jsonl_path=CONVERSION_LOG):
+    """All conversion events - binary records plus JSONL fallbacks - in timestamp order"""
+    flush_log_buffers()
+    records = []
+    
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        data = b''
+    
+    if data:
+        models = load_conversion_models()
+        # Ignore a trailing partial record from a write still in progress
+        usable = len(data) - len(data) % CONVERSION_RECORD.size
+        for ts, lead_id, model_id, rate, lower, upper, predictions, conversions in CONVERSION_RECORD.iter_unpack(data[:usable]):
+            records.append({
+                'timestamp': datetime.fromtimestamp(ts).isoformat(),
+                'lead_id': lead_id,
+                'model_version': models.get(str(model_id), f'{model_id:08x}'),
+                'conversion_rate_after': rate,
+                'total_predictions': predictions,
+                'total_conversions': conversions,
+                'confidence_interval': {'lower': lower, 'upper': upper}
+            })
+    
+    # Events whose lead id did not fit the binary record (and any from before it existed)
+    try:
+        with open(jsonl_path, 'rb') as f:
+            for line in f:
+                if line.endswith(b'\n'):
+                    records.append(json_loads(line))
+    except FileNotFoundError:
+        pass
+    
+    # ISO timestamps from the same clock sort chronologically as strings
+    records.sort(key=lambda record: record['timestamp'])
+    return records
 
 def manage_model_memory():
     """Smart memory management for optimal performance"""
     global mab_predictor
     
     try:
+        mab_predictor.evict_idle()
+        
         current_memory = mab_predictor.get_memory_usage()
         
         if current_memory > 0:  # If psutil is available
@@ -666,66 +1168,57 @@ def manage_model_memory():
 def retire_old_models(keep_recent=5):
     """Automatically retire old models to prevent memory bloat"""
     
-    performance_file = os.path.join(os.path.dirname(__file__), '..', '..', 'metadata', 'model_performance.json')
-    
-    try:
-        with open(performance_file, 'r') as f:
-            performance_data = json.load(f)
-    except FileNotFoundError:
-        return
-    
-    # Sort models by last_updated
-    models_by_date = sorted(
-        performance_data.items(),
-        key=lambda x: x[1]['last_updated'],
-        reverse=True
-    )
-    
-    updated = False
-    
-    # Keep only recent models active
-    for i, (model_version, data) in enumerate(models_by_date):
-        if i < keep_recent:
-            if data['status'] != 'active':
-                data['status'] = 'active'
-                updated = True
-        else:
-            if data['status'] == 'active':
-                data['status'] = 'retired'
-                updated = True
-                print(f" Auto-retired old model: {model_version}")
-    
-    # Save if updated
-    if updated:
-        with open(performance_file, 'w') as f:
-            json.dump(performance_data, f, indent=2)
+    with _perf_lock:
+        performance_data = load_performance_data()
+        if not performance_data:
+            return
+        
+        # Sort models by last update time
+        models_by_date = sorted(
+            performance_data.items(),
+            key=lambda x: last_updated_ts(x[1]),
+            reverse=True
+        )
+        
+        updated = False
+        
+        # Keep only recent models active
+        for i, (model_version, data) in enumerate(models_by_date):
+            if i < keep_recent:
+                if data['status'] != 'active':
+                    data['status'] = 'active'
+                    updated = True
+            else:
+                if data['status'] == 'active':
+                    data['status'] = 'retired'
+                    updated = True
+                    print(f" Auto-retired old model: {model_version}")
+        
+        # Save if updated - status changes move traffic, so write them through
+        if updated:
+            mark_performance_dirty(force_flush=True)
+            invalidate_allocation_cache()
 
 def add_new_model(model_version):
     """Add a new model to the optimized bandit system"""
     
-    performance_file = os.path.join(os.path.dirname(__file__), '..', '..', 'metadata', 'model_performance.json')
-    os.makedirs(os.path.dirname(performance_file), exist_ok=True)
-    
-    try:
-        with open(performance_file, 'r') as f:
-            performance_data = json.load(f)
-    except FileNotFoundError:
-        performance_data = {}
-    
-    # Add new model
-    performance_data[model_version] = {
-        'total_predictions': 0,
-        'total_conversions': 0,
-        'conversion_rate': 0.0,
-        'first_seen': datetime.now().isoformat(),
-        'last_updated': datetime.now().isoformat(),
-        'status': 'active',
-        'confidence_interval': {'lower': 0, 'upper': 0}
-    }
-    
-    # Save updated data
-    with open(performance_file, 'w') as f:
-        json.dump(performance_data, f, indent=2)
+    with _perf_lock:
+        performance_data = load_performance_data()
+        
+        # Add new model
+        performance_data[model_version] = {
+            'total_predictions': 0,
+            'total_conversions': 0,
+            'conversion_rate': 0.0,
+            'first_seen': datetime.now().isoformat(),
+            'last_updated_ts': time.time(),
+            'status': 'active',
+            'confidence_interval': {'lower': 0, 'upper': 0}
+        }
+        
+        # Save updated data
+        mark_performance_dirty(force_flush=True)
+        invalidate_allocation_cache()
     
     print(f" Added new model to optimized bandit: {model_version}")
     
@@ -735,69 +1228,74 @@ def add_new_model(model_version):
 def show_bandit_status():
     """Enhanced status display with performance metrics"""
     
-    performance_file = os.path.join(os.path.dirname(__file__), '..', '..', 'metadata', 'model_performance.json')
-    
     try:
-        with open(performance_file, 'r') as f:
-            performance_data = json.load(f)
+        performance_data = load_performance_data()
+        if not performance_data:
+            print(" No performance data found yet")
+            return
         
-        print("\n OPTIMIZED MULTI-ARMED BANDIT STATUS")
-        print("=" * 70)
+        # Status is assembled in memory and written out once
+        buf = io.StringIO()
+        buf.write("\n OPTIMIZED MULTI-ARMED BANDIT STATUS\n")
+        buf.write("=" * 70 + "\n")
         
         # Memory status
         try:
             memory_usage = mab_predictor.get_memory_usage()
             if memory_usage > 0:
-                print(f" Memory Usage: {memory_usage:.1f}GB")
+                buf.write(f" Memory Usage: {memory_usage:.1f}GB\n")
         except:
             pass
         
-        # Model status
-        active_models = {k: v for k, v in performance_data.items() if v.get('status', 'active') == 'active'}
-        retired_models = {k: v for k, v in performance_data.items() if v.get('status', 'active') != 'active'}
+        # Model status - one pass bucketing by status
+        active_models = []
+        retired_models = []
+        for model, data in performance_data.items():
+            (active_models if data.get('status', 'active') == 'active' else retired_models).append((model, data))
         
-        print(f"\n ACTIVE MODELS ({len(active_models)}):")
-        print("-" * 40)
+        buf.write(f"\n ACTIVE MODELS ({len(active_models)}):\n")
+        buf.write("-" * 40 + "\n")
         
-        for model, data in active_models.items():
+        for model, data in active_models:
             ci = data.get('confidence_interval', {'lower': 0, 'upper': 0})
-            print(f"🔹 {model}:")
-            print(f"   Predictions: {data['total_predictions']:,}")
-            print(f"   Conversions: {data['total_conversions']:,}")
-            print(f"   Rate: {data['conversion_rate']:.1f}%")
-            print(f"   Confidence: [{ci['lower']:.1f}%, {ci['upper']:.1f}%]")
-            print(f"   Status: {data['status'].upper()}")
-            print()
+            buf.write(f"🔹 {model}:\n"
+                      f"   Predictions: {data['total_predictions']:,}\n"
+                      f"   Conversions: {data['total_conversions']:,}\n"
+                      f"   Rate: {data['conversion_rate']:.1f}%\n"
+                      f"   Confidence: [{ci['lower']:.1f}%, {ci['upper']:.1f}%]\n"
+                      f"   Status: {data['status'].upper()}\n\n")
         
         if retired_models:
-            print(f" RETIRED MODELS ({len(retired_models)}):")
-            print("-" * 35)
-            for model, data in retired_models.items():
-                print(f"🔸 {model}: {data['conversion_rate']:.1f}% ({data['total_conversions']}/{data['total_predictions']})")
+            buf.write(f" RETIRED MODELS ({len(retired_models)}):\n")
+            buf.write("-" * 35 + "\n")
+            for model, data in retired_models:
+                buf.write(f"🔸 {model}: {data['conversion_rate']:.1f}% ({data['total_conversions']}/{data['total_predictions']})\n")
         
         # Current allocation
         allocation = get_traffic_allocation()
-        print("\n🚦 CURRENT TRAFFIC ALLOCATION:")
-        print("-" * 35)
+        buf.write("\n🚦 CURRENT TRAFFIC ALLOCATION:\n")
+        buf.write("-" * 35 + "\n")
         
         for model, weight in allocation.items():
             if model not in ['reason', 'winner', 'algorithm', 'total_models']:
-                print(f"   {model}: {weight:.1%}")
+                buf.write(f"   {model}: {weight:.1%}\n")
         
-        print(f"\n Algorithm: {allocation.get('algorithm', 'unknown')}")
-        print(f" Current Winner: {allocation.get('winner', 'none')}")
-        print(f" Total Active Models: {allocation.get('total_models', 0)}")
+        buf.write(f"\n Algorithm: {allocation.get('algorithm', 'unknown')}\n")
+        buf.write(f" Current Winner: {allocation.get('winner', 'none')}\n")
+        buf.write(f" Total Active Models: {allocation.get('total_models', 0)}\n")
         
         # Performance summary
         if active_models:
-            rates = [data['conversion_rate'] for data in active_models.values()]
-            print(f"\n PERFORMANCE SUMMARY:")
-            print(f"   Best Rate: {max(rates):.1f}%")
-            print(f"   Worst Rate: {min(rates):.1f}%")
-            print(f"   Avg Rate: {np.mean(rates):.1f}%")
-            print(f"   Performance Spread: {max(rates) - min(rates):.1f}%")
+            rates = np.fromiter((data['conversion_rate'] for _, data in active_models), dtype=np.float64, count=len(active_models))
+            best, worst = rates.max(), rates.min()
+            buf.write("\n PERFORMANCE SUMMARY:\n")
+            buf.write(f"   Best Rate: {best:.1f}%\n")
+            buf.write(f"   Worst Rate: {worst:.1f}%\n")
+            buf.write(f"   Avg Rate: {rates.mean():.1f}%\n")
+            buf.write(f"   Performance Spread: {best - worst:.1f}%\n")
         
-        print("=" * 70)
+        buf.write("=" * 70 + "\n")
+        sys.stdout.write(buf.getvalue())
         
     except FileNotFoundError:
         print(" No performance data found yet")
@@ -810,9 +1308,9 @@ def benchmark_mab_performance():
     
     # Generate test data
     test_data = pd.DataFrame({
-        'feature_1': np.random.randn(1000),
-        'feature_2': np.random.randn(1000),
-        'feature_3': np.random.randn(1000)
+        'feature_1': RNG.standard_normal(1000),
+        'feature_2': RNG.standard_normal(1000),
+        'feature_3': RNG.standard_normal(1000)
     })
     
     # Test model selection speed
@@ -854,8 +1352,8 @@ def benchmark_mab_performance():
 def initialize_real_models():
     """Initialize MAB system with actual trained models only"""
     
-    performance_file = os.path.join(os.path.dirname(__file__), '..', '..', 'metadata', 'model_performance.json')
-    models_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'models')
+    global _perf_cache
+    models_dir = MODELS_DIR
     
     # Get actual model files
     actual_models = []
@@ -873,11 +1371,7 @@ def initialize_real_models():
             actual_models = [latest_model]
     
     # Clean performance data - keep only real models
-    try:
-        with open(performance_file, 'r') as f:
-            performance_data = json.load(f)
-    except FileNotFoundError:
-        performance_data = {}
+    performance_data = load_performance_data()
     
     # Remove demo models and keep only actual models
     cleaned_data = {}
@@ -898,15 +1392,16 @@ def initialize_real_models():
                 'total_conversions': 0,
                 'conversion_rate': 0.0,
                 'first_seen': datetime.now().isoformat(),
-                'last_updated': datetime.now().isoformat(),
+                'last_updated_ts': time.time(),
                 'status': 'active',
                 'confidence_interval': {'lower': 0, 'upper': 0}
             }
             print(f" Added actual model: {model}")
     
     # Save cleaned data
-    with open(performance_file, 'w') as f:
-        json.dump(cleaned_data, f, indent=2)
+    with _perf_lock:
+        _perf_cache = cleaned_data
+        mark_performance_dirty(force_flush=True)
     
     print(f" MAB system initialized with {len(cleaned_data)} real models")
     return cleaned_data
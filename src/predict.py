@@ -2,6 +2,7 @@ from datetime import datetime
 import os
 import json
 import joblib
+import numpy as np
 import pandas as pd
 #from baseLine_stats import baseLine_stats
 from monitor.monitor import monitor_predictions, predict_with_mab_optimized, track_model_performance, choose_model_for_prediction
@@ -283,7 +284,7 @@ def predict():
             'firstname': lead_firstNames,
             'lastname': lead_lastNames,
             'email': lead_emails,
-            'lead_score': predictions,
+            'lead_score': np.asarray(predictions, dtype=np.float32),
             'model_used': selected_model,
             'prediction_timestamp': datetime.now().isoformat(),
             'mab_selection': True if model_name != "default_model" else False
@@ -293,10 +294,23 @@ def predict():
         predictions_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'predictions')
         os.makedirs(predictions_dir, exist_ok=True)
         
-        prediction_filename = f'lead_scores_{unlabeled_temp}_{selected_model.replace("model_V", "")}.csv'
-        prediction_path = os.path.join(predictions_dir, prediction_filename)
+        prediction_stem = f'lead_scores_{unlabeled_temp}_{selected_model.replace("model_V", "")}'
         
-        results_df.to_csv(prediction_path, index=False)
+        # Parquet: typed, compressed and columnar - the API loads it much faster than CSV
+        # Written to a per-process temp file and renamed into place, so the API's directory
+        # watcher and loader never pick up a half-written file
+        try:
+            prediction_filename = f'{prediction_stem}.parquet'
+            prediction_path = os.path.join(predictions_dir, prediction_filename)
+            tmp_path = f"{prediction_path}.{os.getpid()}.tmp"
+            results_df.to_parquet(tmp_path, engine='pyarrow', index=False)
+        except ImportError:
+            print(" pyarrow not installed - saving predictions as CSV")
+            prediction_filename = f'{prediction_stem}.csv'
+            prediction_path = os.path.join(predictions_dir, prediction_filename)
+            tmp_path = f"{prediction_path}.{os.getpid()}.tmp"
+            results_df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, prediction_path)
         print(f" Predictions saved: {prediction_filename}")
         
         # Summary statistics
@@ -315,7 +329,8 @@ def predict():
         print("=" * 50)
         print(" PREDICTION WITH MAB MONITORING COMPLETED!")
         
-        return results_df.to_dict('records')
+        # Hand back the full-precision float64 scores - float32 is only the on-disk format
+        return results_df.assign(lead_score=predictions).to_dict('records')
         
     except Exception as e:
         print(f" Error saving predictions: {e}")